@@ -4,46 +4,179 @@ Anime Quote Fetcher
 
 A script to fetch anime quotes from the animechan.io API.
 Supports fetching quotes for specific anime shows with proper error handling,
-rate limiting, and formatted output.
+rate limiting, concurrent fetching, local response caching, full-catalogue
+harvesting into a searchable SQLite corpus, and formatted output.
 """
 
 import argparse
+import io
 import json
 import os
 import sys
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Set, TextIO, Tuple
 from urllib.parse import quote
 
 import requests
 
+from http_cache import CachingAdapter, ResponseCache
+from quote_corpus import QuoteCorpus, quote_hash
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by all workers of a fetcher."""
+    
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            rate: Tokens added per second (0 disables limiting)
+            capacity: Maximum number of tokens that can accumulate (burst size)
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        if self.rate <= 0:
+            self._wait_for_pause()
+            return
+        
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out tokens for a while, e.g. after a 429 response.
+        
+        Args:
+            seconds: How long every worker should hold off
+        """
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+    
+    def _wait_for_pause(self) -> None:
+        """Sleep until any active pause has elapsed."""
+        while True:
+            with self.lock:
+                wait = self.paused_until - time.monotonic()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """
+    Parse a Retry-After header into a delay in seconds.
+    
+    Args:
+        value: Header value, either delta-seconds or an HTTP date
+        default: Delay to use when the header is missing or malformed
+        
+    Returns:
+        Number of seconds to wait before retrying
+    """
+    if not value:
+        return default
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def positive_int(value: str) -> int:
+    """argparse type for options that must be an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
 
 class AnimeQuoteFetcher:
     """Client for fetching anime quotes from animechan.io API."""
     
     BASE_URL = "https://api.animechan.io/v1"
+    MAX_RETRIES = 3
+    MAX_PAGES = 100
     
-    def __init__(self, rate_limit: float = 1.0):
+    def __init__(
+        self,
+        rate_limit: float = 1.0,
+        concurrency: int = 1,
+        cache: Optional[ResponseCache] = None
+    ):
         """
         Initialize the quote fetcher.
         
         Args:
-            rate_limit: Delay in seconds between API requests
+            rate_limit: Minimum average delay in seconds between API requests,
+                enforced globally across all workers
+            concurrency: Number of requests allowed in flight at once
+            cache: Optional on-disk response cache mounted on the session
         """
         self.rate_limit = rate_limit
+        self.concurrency = max(1, concurrency)
+        self.limiter = TokenBucket(
+            rate=1.0 / rate_limit if rate_limit > 0 else 0,
+            capacity=self.concurrency
+        )
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Anime-Quote-Fetcher/1.0'
         })
+        
+        self.cache = cache
+        if cache is not None:
+            adapter = CachingAdapter(cache, pool_maxsize=self.concurrency)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
     
-    def fetch_quotes(self, anime_name: str) -> Dict:
+    def fetch_quotes(self, anime_name: str, page: int = 1) -> Dict:
         """
         Fetch quotes for a specific anime.
         
         Args:
             anime_name: Name of the anime to fetch quotes for
+            page: Page of results to fetch (1-based)
             
         Returns:
             Dict containing the API response
@@ -54,42 +187,137 @@ class AnimeQuoteFetcher:
         # URL encode the anime name to handle spaces and special characters
         encoded_name = quote(anime_name)
         url = f"{self.BASE_URL}/quotes?anime={encoded_name}"
+        if page > 1:
+            url += f"&page={page}"
         
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            # Rate limiting
-            time.sleep(self.rate_limit)
-            
-            return response.json()
+            for attempt in range(self.MAX_RETRIES + 1):
+                # Rate limiting (shared across all workers); cache hits are free
+                if self.cache is None or not self.cache.can_serve(url):
+                    self.limiter.acquire()
+                response = self.session.get(url, timeout=10)
+                
+                if response.status_code == 429 and attempt < self.MAX_RETRIES:
+                    delay = parse_retry_after(
+                        response.headers.get('Retry-After'),
+                        default=max(self.rate_limit, 1.0) * 2 ** attempt
+                    )
+                    self.limiter.pause(delay)
+                    continue
+                
+                response.raise_for_status()
+                return response.json()
             
         except requests.exceptions.RequestException as e:
             raise requests.RequestException(f"Failed to fetch quotes for '{anime_name}': {e}")
     
-    def fetch_multiple_anime(self, anime_list: List[str]) -> Dict[str, Dict]:
+    def fetch_all_pages(self, anime_name: str, max_pages: Optional[int] = None) -> Dict:
+        """
+        Fetch every page of quotes for a specific anime.
+        
+        Pages are walked until the API returns an empty page or a page that
+        contains no quotes not already seen (quotes are de-duplicated by
+        content hash).
+        
+        Args:
+            anime_name: Name of the anime to fetch quotes for
+            max_pages: Upper bound on pages to walk (default: MAX_PAGES)
+            
+        Returns:
+            Dict in the same layout as fetch_quotes, with all unique quotes
+            under 'data' and the number of pages walked under 'pages'
+            
+        Raises:
+            requests.RequestException: If any page request fails
+        """
+        max_pages = max_pages or self.MAX_PAGES
+        seen = set()
+        quotes = []
+        pages = 0
+        
+        for page in range(1, max_pages + 1):
+            page_quotes = self.fetch_quotes(anime_name, page=page).get('data') or []
+            pages = page
+            
+            new_quotes = []
+            for quote_data in page_quotes:
+                key = quote_hash(quote_data)
+                if key not in seen:
+                    seen.add(key)
+                    new_quotes.append(quote_data)
+            
+            if not new_quotes:
+                break
+            quotes.extend(new_quotes)
+        
+        return {"status": "success", "data": quotes, "pages": pages}
+    
+    def _fetch_or_error(self, anime_name: str, all_pages: bool = False) -> Dict:
+        """Fetch quotes for one anime, returning an error record on failure."""
+        try:
+            if all_pages:
+                return self.fetch_all_pages(anime_name)
+            return self.fetch_quotes(anime_name)
+        except requests.RequestException as e:
+            return {"error": str(e)}
+    
+    def fetch_multiple_anime(
+        self,
+        anime_list: List[str],
+        on_result: Optional[Callable[[str, Dict], None]] = None,
+        collect: bool = True,
+        all_pages: bool = False
+    ) -> Dict[str, Dict]:
         """
         Fetch quotes for multiple anime shows.
         
+        Requests run on a thread pool of ``concurrency`` workers, and a
+        status line is printed for each anime as soon as it completes.
+        
         Args:
             anime_list: List of anime names
+            on_result: Optional callback invoked with (anime_name, data) as
+                each fetch completes
+            collect: Keep every response in the returned dict. Pass False
+                when on_result consumes the data, so memory stays bounded
+            all_pages: Walk every page for each anime instead of only the first
             
         Returns:
-            Dict mapping anime names to their quote data
+            Dict mapping anime names to their quote data, in request order
+            (empty when collect is False)
         """
-        results = {}
+        completed = {}
+        
+        def report(anime_name: str, data: Dict) -> None:
+            if collect:
+                completed[anime_name] = data
+            if "error" in data:
+                print(f"  ✗ {anime_name}: {data['error']}")
+            else:
+                print(f"  ✓ {anime_name}: found {len(data.get('data', []))} quotes")
+            if on_result is not None:
+                on_result(anime_name, data)
+        
+        # Fetch each name once, whichever mode runs
+        unique_names = list(dict.fromkeys(anime_list))
         
-        for anime_name in anime_list:
-            print(f"Fetching quotes for: {anime_name}")
-            try:
-                quotes_data = self.fetch_quotes(anime_name)
-                results[anime_name] = quotes_data
-                print(f"  ✓ Found {len(quotes_data.get('data', []))} quotes")
-            except requests.RequestException as e:
-                print(f"  ✗ Error: {e}")
-                results[anime_name] = {"error": str(e)}
+        if self.concurrency == 1:
+            for anime_name in unique_names:
+                print(f"Fetching quotes for: {anime_name}")
+                report(anime_name, self._fetch_or_error(anime_name, all_pages))
+        else:
+            print(f"Fetching with {self.concurrency} concurrent workers...")
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                futures = {
+                    executor.submit(self._fetch_or_error, anime_name, all_pages): anime_name
+                    for anime_name in unique_names
+                }
+                for future in as_completed(futures):
+                    report(futures[future], future.result())
         
-        return results
+        if not collect:
+            return {}
+        return {name: completed[name] for name in unique_names}
 
 
 class QuoteFormatter:
@@ -109,44 +337,225 @@ class QuoteFormatter:
         character = quote_data.get('character', {}).get('name', 'Unknown')
         anime = quote_data.get('anime', {}).get('name', 'Unknown')
         quote_text = quote_data.get('content', 'No quote available')
+        top, bottom = QuoteFormatter.frame(anime)
         
         return f"""
-╭─ {anime} ─╮
+{top}
 │ Character: {character}
 │ Quote: "{quote_text}"
-╰─{'─' * (len(anime) + 2)}─╯
+{bottom}
 """
     
     @staticmethod
-    def format_all_quotes(results: Dict[str, Dict]) -> str:
+    @lru_cache(maxsize=1024)
+    def frame(anime: str) -> Tuple[str, str]:
+        """
+        Return the top and bottom box borders for an anime, cached per name.
+        
+        Args:
+            anime: Anime name shown in the top border
+            
+        Returns:
+            Tuple of (top border, bottom border)
+        """
+        return f"╭─ {anime} ─╮", f"╰─{'─' * (len(anime) + 2)}─╯"
+    
+    @staticmethod
+    def format_all_quotes(results: Dict[str, Dict], limit_per_anime: Optional[int] = None) -> str:
         """
         Format all quotes for display.
         
         Args:
             results: Dictionary mapping anime names to quote data
+            limit_per_anime: Show at most this many quotes per anime
             
         Returns:
             Formatted string containing all quotes
         """
-        output = []
-        
+        buffer = io.StringIO()
+        renderer = QuoteRenderer(stream=buffer, limit_per_anime=limit_per_anime)
         for anime_name, data in results.items():
-            if "error" in data:
-                output.append(f"\n❌ {anime_name}: {data['error']}")
-                continue
-            
-            quotes = data.get('data', [])
-            if not quotes:
-                output.append(f"\n❌ {anime_name}: No quotes found")
-                continue
-            
-            output.append(f"\n🎌 {anime_name.upper()} ({len(quotes)} quotes)")
-            output.append("=" * 50)
-            
-            for quote in quotes:
-                output.append(QuoteFormatter.format_quote_display(quote))
+            renderer.render(anime_name, data)
+        
+        return buffer.getvalue().rstrip("\n")
+
+
+class QuoteRenderer:
+    """Writes formatted quotes to a stream incrementally, one anime at a time."""
+    
+    def __init__(self, stream: Optional[TextIO] = None, limit_per_anime: Optional[int] = None):
+        """
+        Initialize the renderer.
+        
+        Args:
+            stream: Text stream to write to (default: sys.stdout)
+            limit_per_anime: Show at most this many quotes per anime
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.limit_per_anime = limit_per_anime
+    
+    def render(self, anime_name: str, data: Dict) -> None:
+        """
+        Format the result for one anime and write it with a single call.
+        
+        Args:
+            anime_name: Name of the anime as requested
+            data: API response or error record
+        """
+        if "error" in data:
+            self.stream.write(f"\n❌ {anime_name}: {data['error']}\n")
+            self.stream.flush()
+            return
+        
+        quotes = data.get('data', [])
+        if not quotes:
+            self.stream.write(f"\n❌ {anime_name}: No quotes found\n")
+            self.stream.flush()
+            return
+        
+        shown = quotes if self.limit_per_anime is None else quotes[:self.limit_per_anime]
+        parts = [f"\n🎌 {anime_name.upper()} ({len(quotes)} quotes)", "=" * 50]
+        parts.extend(QuoteFormatter.format_quote_display(quote) for quote in shown)
+        if len(shown) < len(quotes):
+            parts.append(f"… {len(quotes) - len(shown)} more quotes not shown")
+        parts.append("")
+        
+        self.stream.write("\n".join(parts))
+        self.stream.flush()
+
+
+class RunSummary:
+    """Running counters for a fetch run, updated one result at a time."""
+    
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self.successful_fetches = 0
+        self.failed_fetches = 0
+        self.total_quotes = 0
+    
+    def add(self, data: Dict) -> None:
+        """
+        Count a single anime result.
+        
+        Args:
+            data: API response or error record for one anime
+        """
+        if "error" in data:
+            self.failed_fetches += 1
+        else:
+            self.successful_fetches += 1
+            self.total_quotes += len(data.get("data", []))
+    
+    def as_dict(self, total_anime_requested: int) -> Dict:
+        """Return the counters in the layout used by saved result files."""
+        return {
+            "total_anime_requested": total_anime_requested,
+            "successful_fetches": self.successful_fetches,
+            "failed_fetches": self.failed_fetches,
+            "total_quotes": self.total_quotes
+        }
+
+
+class ResultStreamWriter:
+    """Appends one NDJSON record per anime as soon as it is fetched."""
+    
+    def __init__(self, filepath: Path, anime_list: List[str]):
+        """
+        Open (or resume) an NDJSON results file.
+        
+        Existing successful records are loaded into the summary counters and
+        the ``completed`` set, so a resumed run can skip those anime. Failed
+        records are not counted and will be retried.
+        
+        Args:
+            filepath: NDJSON file to append to
+            anime_list: List of anime names requested in this run
+        """
+        self.path = filepath
+        self.anime_list = anime_list
+        self.summary = RunSummary()
+        self.completed: Set[str] = set()
+        
+        needs_newline = False
+        if filepath.exists():
+            needs_newline = self._load_existing()
+        
+        self.file = open(filepath, 'a', encoding='utf-8')
+        if needs_newline:
+            # A crashed run may have left a truncated last line
+            self.file.write("\n")
+        self._write_record({
+            "type": "run",
+            "timestamp": datetime.now().isoformat(),
+            "requested_anime": anime_list
+        })
+    
+    def _load_existing(self) -> bool:
+        """
+        Read successful records from an existing file.
+        
+        Returns:
+            True if the file does not end with a newline
+        """
+        last_line = ""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                last_line = line
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("type") != "result":
+                    continue
+                
+                anime_name = record.get("anime")
+                result = record.get("result", {})
+                if "error" in result or anime_name in self.completed:
+                    continue
+                self.completed.add(anime_name)
+                self.summary.add(result)
         
-        return "\n".join(output)
+        return bool(last_line) and not last_line.endswith("\n")
+    
+    def _write_record(self, record: Dict) -> None:
+        """Write and flush a single NDJSON line."""
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+    
+    def write(self, anime_name: str, data: Dict) -> None:
+        """
+        Persist the result for one anime and update the counters.
+        
+        Args:
+            anime_name: Name of the anime
+            data: API response or error record
+        """
+        self._write_record({
+            "type": "result",
+            "anime": anime_name,
+            "fetched_at": datetime.now().isoformat(),
+            "result": data
+        })
+        if "error" not in data:
+            self.completed.add(anime_name)
+        self.summary.add(data)
+    
+    def close(self) -> None:
+        """Append the run summary and close the file."""
+        if self.file.closed:
+            return
+        self._write_record({
+            "type": "summary",
+            "timestamp": datetime.now().isoformat(),
+            **self.summary.as_dict(len(self.anime_list))
+        })
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 
 class OutputManager:
@@ -177,22 +586,41 @@ class OutputManager:
         filename = f"{date_slug}_anime_quotes.json"
         filepath = self.base_dir / filename
         
+        summary = RunSummary()
+        for data in results.values():
+            summary.add(data)
+        
         output_data = {
             "timestamp": datetime.now().isoformat(),
             "requested_anime": anime_list,
             "results": results,
-            "summary": {
-                "total_anime_requested": len(anime_list),
-                "successful_fetches": len([r for r in results.values() if "error" not in r]),
-                "failed_fetches": len([r for r in results.values() if "error" in r]),
-                "total_quotes": sum(len(r.get("data", [])) for r in results.values() if "error" not in r)
-            }
+            "summary": summary.as_dict(len(anime_list))
         }
         
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(output_data, f, indent=2, ensure_ascii=False)
         
         return str(filepath)
+    
+    def open_stream(self, anime_list: List[str], resume_path: Optional[str] = None) -> ResultStreamWriter:
+        """
+        Open a streaming NDJSON writer for a run.
+        
+        Args:
+            anime_list: List of anime names that were requested
+            resume_path: Existing NDJSON file to append to instead of
+                starting a new date-based file
+            
+        Returns:
+            Writer that persists each result as it arrives
+        """
+        if resume_path:
+            filepath = Path(resume_path)
+        else:
+            date_slug = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            filepath = self.base_dir / f"{date_slug}_anime_quotes.ndjson"
+        
+        return ResultStreamWriter(filepath, anime_list)
 
 
 def load_anime_list_from_file(filepath: str) -> List[str]:
@@ -252,7 +680,14 @@ Examples:
   %(prog)s --anime "One Punch Man" "Naruto"
   %(prog)s --file anime_list.json
   %(prog)s --popular
+  %(prog)s --popular --concurrency 4 --rate-limit 0.25
+  %(prog)s --popular --offline
+  %(prog)s --popular --format ndjson
+  %(prog)s --popular --resume results/2025-07-27_17-23-05_anime_quotes.ndjson
+  %(prog)s --popular --harvest --output-only
+  %(prog)s --search "strong hero"
   %(prog)s --anime "Attack on Titan" --output-only
+  %(prog)s --popular --harvest --limit-per-anime 3
         """
     )
     
@@ -272,6 +707,29 @@ Examples:
         action='store_true',
         help='Fetch quotes for popular anime shows'
     )
+    input_group.add_argument(
+        '--search', '-s',
+        metavar='QUERY',
+        help='Full-text search the local quote corpus without touching the API'
+    )
+    
+    # Corpus options
+    parser.add_argument(
+        '--harvest',
+        action='store_true',
+        help='Walk every page of quotes for each anime and add them to the local corpus'
+    )
+    parser.add_argument(
+        '--corpus',
+        default='quote_corpus.db',
+        help='SQLite database for the local quote corpus (default: quote_corpus.db)'
+    )
+    parser.add_argument(
+        '--search-limit',
+        type=int,
+        default=20,
+        help='Maximum number of search results to show (default: 20)'
+    )
     
     # Output options
     parser.add_argument(
@@ -284,14 +742,82 @@ Examples:
         action='store_true',
         help='Don\'t save results to file, only display in console'
     )
+    parser.add_argument(
+        '--limit-per-anime', '-l',
+        type=positive_int,
+        help='Display at most this many quotes per anime (all quotes are still saved)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['ndjson', 'json'],
+        help='Results file format: json writes a single document at the end, '
+             'ndjson streams one record per anime as it is fetched '
+             '(default: json, or ndjson with --resume)'
+    )
+    parser.add_argument(
+        '--resume',
+        metavar='NDJSON_FILE',
+        help='Append to an existing NDJSON results file, skipping anime already fetched'
+    )
     parser.add_argument(
         '--rate-limit', '-r',
         type=float,
         default=1.0,
-        help='Delay between API requests in seconds (default: 1.0)'
+        help='Average delay between API requests in seconds, shared by all workers (default: 1.0)'
+    )
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=1,
+        help='Number of concurrent requests (default: 1)'
+    )
+    
+    # Cache options
+    parser.add_argument(
+        '--cache-dir',
+        default='.cache',
+        help='Directory for the local HTTP response cache (default: .cache)'
+    )
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=3600.0,
+        help='Seconds before a cached response is revalidated (default: 3600)'
+    )
+    parser.add_argument(
+        '--cache-max-mb',
+        type=float,
+        default=50.0,
+        help='Maximum cache size in megabytes before eviction (default: 50)'
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the local HTTP response cache'
+    )
+    cache_group.add_argument(
+        '--offline',
+        action='store_true',
+        help='Serve responses only from the local cache, never touching the API'
     )
     
     args = parser.parse_args()
+    if args.format is None:
+        args.format = 'ndjson' if args.resume else 'json'
+    
+    if args.resume and (args.format != 'ndjson' or args.no_save):
+        parser.error("--resume requires NDJSON output (and cannot be combined with --no-save)")
+    
+    # Searching the local corpus never touches the API
+    if args.search:
+        corpus = QuoteCorpus(args.corpus)
+        matches = corpus.search(args.search, limit=args.search_limit)
+        print(f"🔎 {len(matches)} match(es) for \"{args.search}\" in {corpus.count()} local quotes")
+        for quote_data in matches:
+            print(QuoteFormatter.format_quote_display(quote_data))
+        corpus.close()
+        return
     
     # Determine anime list based on input option
     if args.anime:
@@ -308,32 +834,77 @@ Examples:
     print("=" * 60)
     
     # Initialize components
-    fetcher = AnimeQuoteFetcher(rate_limit=args.rate_limit)
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(
+            cache_dir=args.cache_dir,
+            ttl=args.cache_ttl,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+            offline=args.offline
+        )
+    fetcher = AnimeQuoteFetcher(
+        rate_limit=args.rate_limit,
+        concurrency=args.concurrency,
+        cache=cache
+    )
     output_manager = OutputManager()
     
+    stream = None
     try:
-        # Fetch quotes
-        results = fetcher.fetch_multiple_anime(anime_list)
+        summary = RunSummary()
+        pending = anime_list
+        
+        # Open the streaming writer first so every result is persisted on arrival
+        if not args.no_save and args.format == 'ndjson':
+            stream = output_manager.open_stream(anime_list, resume_path=args.resume)
+            summary = stream.summary
+            pending = [name for name in anime_list if name not in stream.completed]
+            if len(pending) < len(anime_list):
+                print(f"⏭️  Skipping {len(anime_list) - len(pending)} anime already in {stream.path}")
         
-        # Display results
+        corpus = QuoteCorpus(args.corpus) if args.harvest else None
+        renderer = None
         if not args.output_only:
-            formatted_output = QuoteFormatter.format_all_quotes(results)
-            print(formatted_output)
+            renderer = QuoteRenderer(limit_per_anime=args.limit_per_anime)
+        
+        def handle_result(anime_name: str, data: Dict) -> None:
+            if corpus is not None and "error" not in data:
+                added = corpus.add_quotes(data.get('data', []))
+                print(f"    📚 {added} new quotes added to corpus ({data.get('pages', 1)} pages)")
+            if stream is not None:
+                stream.write(anime_name, data)
+            else:
+                summary.add(data)
+            # Display results as they arrive
+            if renderer is not None:
+                renderer.render(anime_name, data)
+        
+        # Fetch quotes; only keep responses around if the JSON document needs them
+        keep_results = not args.no_save and args.format == 'json'
+        results = fetcher.fetch_multiple_anime(
+            pending,
+            on_result=handle_result,
+            collect=keep_results,
+            all_pages=args.harvest
+        )
         
         # Save results
-        if not args.no_save:
+        if stream is not None:
+            stream.close()
+            print(f"\n💾 Results saved to: {stream.path}")
+        elif not args.no_save:
             saved_file = output_manager.save_results(results, anime_list)
             print(f"\n💾 Results saved to: {saved_file}")
         
         # Print summary
-        successful = len([r for r in results.values() if "error" not in r])
-        total_quotes = sum(len(r.get("data", [])) for r in results.values() if "error" not in r)
-        
         print(f"\n📊 Summary:")
         print(f"  • Total anime requested: {len(anime_list)}")
-        print(f"  • Successful fetches: {successful}")
-        print(f"  • Failed fetches: {len(anime_list) - successful}")
-        print(f"  • Total quotes retrieved: {total_quotes}")
+        print(f"  • Successful fetches: {summary.successful_fetches}")
+        print(f"  • Failed fetches: {summary.failed_fetches}")
+        print(f"  • Total quotes retrieved: {summary.total_quotes}")
+        if corpus is not None:
+            print(f"  • Quotes in local corpus: {corpus.count()}")
+            corpus.close()
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Operation cancelled by user")
@@ -341,6 +912,9 @@ Examples:
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
         sys.exit(1)
+    finally:
+        if stream is not None:
+            stream.close()
 
 
 if __name__ == "__main__":
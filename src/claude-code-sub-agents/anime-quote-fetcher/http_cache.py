@@ -0,0 +1,277 @@
+"""
+On-disk HTTP response cache for the anime quote fetcher.
+
+Provides a requests transport adapter that stores GET response bodies keyed
+on URL together with their ETag/Last-Modified validators. Fresh entries are
+served without touching the network, stale entries are revalidated with
+conditional requests, and an offline mode serves exclusively from cache.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+class ResponseCache:
+    """Directory of cached response bodies with TTL and max-size eviction."""
+    
+    STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+    
+    def __init__(
+        self,
+        cache_dir: str = ".cache",
+        ttl: float = 3600.0,
+        max_bytes: int = 50 * 1024 * 1024,
+        offline: bool = False
+    ):
+        """
+        Initialize the response cache.
+        
+        Args:
+            cache_dir: Directory holding cached entries
+            ttl: Seconds an entry is served without revalidation
+            max_bytes: Total body size above which least recently used
+                entries are evicted
+            offline: Serve only from cache and never touch the network
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.lock = threading.Lock()
+        # Running total of body bytes, so puts only scan the directory to evict
+        self._total_bytes: Optional[int] = None
+        # Entry read by can_serve, handed to the adapter for the same request
+        self._pending = threading.local()
+    
+    @staticmethod
+    def _key(url: str) -> str:
+        """Return the file stem used for a URL."""
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+    
+    def _paths(self, url: str):
+        """Return the (metadata, body) paths for a URL."""
+        key = self._key(url)
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up a cached entry.
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            Dict with 'meta' and 'body' keys, or None on a miss
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            body = body_path.read_bytes()
+        except (OSError, json.JSONDecodeError):
+            return None
+        
+        # Record the access so eviction is least-recently-used
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        return {"meta": meta, "body": body}
+    
+    def is_fresh(self, entry: Dict) -> bool:
+        """Return True if an entry is younger than the TTL."""
+        return time.time() - entry["meta"]["stored_at"] < self.ttl
+    
+    def can_serve(self, url: str) -> bool:
+        """
+        Return True if a request for url will be answered without the network.
+        
+        The entry read here is kept for this thread's next lookup() of the
+        same URL, so the request that follows does not read it again.
+        """
+        if self.offline:
+            return True
+        entry = self.get(url)
+        self._pending.lookup = (url, entry)
+        return entry is not None and self.is_fresh(entry)
+    
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Like get(), but reuse the entry just read by can_serve() for url."""
+        pending = getattr(self._pending, 'lookup', None)
+        self._pending.lookup = None
+        if pending is not None and pending[0] == url:
+            return pending[1]
+        return self.get(url)
+    
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        """
+        Store a response body and its validators.
+        
+        Args:
+            url: Request URL
+            status: HTTP status code of the response
+            headers: Response headers
+            body: Raw response body
+        """
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": {k: headers[k] for k in self.STORED_HEADERS if k in headers},
+            "stored_at": time.time(),
+        }
+        meta_path, body_path = self._paths(url)
+        
+        with self.lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            try:
+                self._total_bytes -= body_path.stat().st_size
+            except OSError:
+                pass
+            self._atomic_write(body_path, body)
+            self._atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+            self._total_bytes += len(body)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+    
+    def touch(self, url: str, headers: Dict[str, str], entry: Optional[Dict] = None) -> None:
+        """
+        Mark an entry as freshly validated after a 304 response.
+        
+        Args:
+            url: Request URL
+            headers: Headers of the 304 response, which may carry new validators
+            entry: The entry being revalidated, if already read
+        """
+        if entry is None:
+            entry = self.get(url)
+        if entry is None:
+            return
+        meta = entry["meta"]
+        meta["stored_at"] = time.time()
+        meta["headers"].update({k: headers[k] for k in self.STORED_HEADERS if k in headers})
+        meta_path, _ = self._paths(url)
+        
+        with self.lock:
+            self._atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+    
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        """Write a file so concurrent readers never see a partial entry."""
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    
+    def _scan(self):
+        """Return (mtime, size, path) for every cached body."""
+        bodies = []
+        for body_path in self.cache_dir.glob("*.body"):
+            try:
+                stat = body_path.stat()
+            except OSError:
+                continue
+            bodies.append((stat.st_mtime, stat.st_size, body_path))
+        return bodies
+    
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        # Rescan rather than trust the running total, which misses other processes
+        bodies = sorted(self._scan())
+        total = sum(size for _, size, _ in bodies)
+        for _, size, body_path in bodies:
+            if total <= self.max_bytes:
+                break
+            body_path.with_suffix('.json').unlink(missing_ok=True)
+            body_path.unlink(missing_ok=True)
+            total -= size
+        self._total_bytes = total
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that answers GET requests from a ResponseCache."""
+    
+    def __init__(self, cache: ResponseCache, **kwargs):
+        """
+        Initialize the adapter.
+        
+        Args:
+            cache: Cache used to store and serve responses
+            **kwargs: Passed through to HTTPAdapter
+        """
+        super().__init__(**kwargs)
+        self.cache = cache
+    
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """Serve, revalidate or fetch-and-store a request."""
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+        
+        entry = self.cache.lookup(request.url)
+        
+        if self.cache.offline:
+            if entry is None:
+                return self._build_response(
+                    request, 504, {}, b'', reason='Not Cached (offline mode)'
+                )
+            return self._cached_response(request, entry)
+        
+        if entry is not None and self.cache.is_fresh(entry):
+            return self._cached_response(request, entry)
+        
+        if entry is not None:
+            validators = entry["meta"]["headers"]
+            if 'ETag' in validators:
+                request.headers['If-None-Match'] = validators['ETag']
+            if 'Last-Modified' in validators:
+                request.headers['If-Modified-Since'] = validators['Last-Modified']
+        
+        response = super().send(request, **kwargs)
+        
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(request.url, response.headers, entry)
+            response.close()
+            return self._cached_response(request, entry)
+        
+        if response.status_code == 200:
+            self.cache.put(request.url, response.status_code, response.headers, response.content)
+        
+        return response
+    
+    def _cached_response(self, request: requests.PreparedRequest, entry: Dict) -> requests.Response:
+        """Build a response object from a cache entry."""
+        meta = entry["meta"]
+        return self._build_response(
+            request, meta["status"], meta["headers"], entry["body"], from_cache=True
+        )
+    
+    @staticmethod
+    def _build_response(
+        request: requests.PreparedRequest,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes,
+        reason: str = 'OK',
+        from_cache: bool = False
+    ) -> requests.Response:
+        """Assemble a requests.Response without a network round-trip."""
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        response.from_cache = from_cache
+        return response
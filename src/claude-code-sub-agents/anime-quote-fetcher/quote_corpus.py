@@ -0,0 +1,141 @@
+"""
+Local SQLite corpus of harvested anime quotes.
+
+Quotes are de-duplicated by a content hash and indexed with an FTS5
+full-text index, so the corpus can be searched instantly without touching
+the animechan.io API.
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime
+from typing import Dict, List
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    anime TEXT NOT NULL,
+    character TEXT NOT NULL,
+    content TEXT NOT NULL,
+    harvested_at TEXT NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS quotes_fts USING fts5(
+    content, character, anime,
+    content='quotes', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS quotes_ai AFTER INSERT ON quotes BEGIN
+    INSERT INTO quotes_fts(rowid, content, character, anime)
+    VALUES (new.id, new.content, new.character, new.anime);
+END;
+"""
+
+
+def quote_hash(quote_data: Dict) -> str:
+    """
+    Compute the de-duplication key for a quote.
+    
+    Whitespace and case are normalized so trivially different copies of the
+    same quote collapse to one row.
+    
+    Args:
+        quote_data: Quote dictionary as returned by the API
+    
+    Returns:
+        Hex digest identifying the quote
+    """
+    parts = (
+        quote_data.get('anime', {}).get('name', ''),
+        quote_data.get('character', {}).get('name', ''),
+        quote_data.get('content', ''),
+    )
+    normalized = "\x1f".join(" ".join(part.split()).casefold() for part in parts)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class QuoteCorpus:
+    """SQLite-backed, full-text searchable store of anime quotes."""
+    
+    def __init__(self, db_path: str = "quote_corpus.db"):
+        """
+        Open (and create if needed) the corpus database.
+        
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+    
+    def add_quotes(self, quotes: List[Dict]) -> int:
+        """
+        Insert quotes, skipping any whose content hash is already stored.
+        
+        Args:
+            quotes: Quote dictionaries as returned by the API
+        
+        Returns:
+            Number of new quotes added
+        """
+        harvested_at = datetime.now().isoformat()
+        rows = [
+            (
+                quote_hash(q),
+                q.get('anime', {}).get('name', 'Unknown'),
+                q.get('character', {}).get('name', 'Unknown'),
+                q.get('content', ''),
+                harvested_at,
+            )
+            for q in quotes
+            if q.get('content')
+        ]
+        
+        with self.conn:
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO quotes "
+                "(content_hash, anime, character, content, harvested_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        return max(cursor.rowcount, 0)
+    
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Full-text search the corpus.
+        
+        Every whitespace-separated term must match (in the quote, character
+        or anime name). Terms are quoted so FTS operators in user input are
+        treated literally.
+        
+        Args:
+            query: Search terms
+            limit: Maximum number of results
+        
+        Returns:
+            Matching quotes, best match first, in the API's quote layout
+        """
+        terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+        if not terms:
+            return []
+        
+        rows = self.conn.execute(
+            "SELECT q.content, q.character, q.anime "
+            "FROM quotes_fts JOIN quotes q ON q.id = quotes_fts.rowid "
+            "WHERE quotes_fts MATCH ? ORDER BY bm25(quotes_fts) LIMIT ?",
+            (" ".join(terms), limit)
+        ).fetchall()
+        
+        return [
+            {"content": content, "character": {"name": character}, "anime": {"name": anime}}
+            for content, character, anime in rows
+        ]
+    
+    def count(self) -> int:
+        """Return the number of quotes in the corpus."""
+        return self.conn.execute("SELECT COUNT(*) FROM quotes").fetchone()[0]
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
@@ -0,0 +1,73 @@
+import argparse
+import time
+
+import matplotlib.pyplot as plt
+import matplotlib.style as mplstyle
+import numpy as np
+
+from box_muller_sampler import iter_sample_chunks
+from box_muller_stats import SampleStats
+from box_muller_visualization import BoxMullerFigure
+from dracula_theme import STYLE_PATH
+
+
+def convergence_frames(n_frames, samples_per_frame, seed=42):
+    """Yield (summary, u1, u2, z1, z2) as the sampler converges, one frame per chunk"""
+    summary = SampleStats()
+    rng = np.random.default_rng(seed)
+    for chunk in iter_sample_chunks(n_frames * samples_per_frame, samples_per_frame, rng):
+        summary.update(*chunk)
+        yield (summary, *chunk)
+
+
+def time_frames(render_frame, n_frames, samples_per_frame):
+    times = []
+    for frame in convergence_frames(n_frames, samples_per_frame):
+        start = time.perf_counter()
+        render_frame(frame)
+        times.append(time.perf_counter() - start)
+    return np.array(times)
+
+
+def rebuild_frame(frame):
+    """Old approach: set rcParams, then build and style the whole figure for every frame
+
+    Each run of the old script applied the theme's rcParams before building
+    the figure, so the style sheet is re-parsed here instead of taken from
+    the registered library. BoxMullerFigure() then runs style_axes on every
+    axes once its patches exist, as the old per-panel code did.
+    """
+    plt.rcParams.update(mplstyle.rc_params_from_file(STYLE_PATH, use_default_template=False))
+    BoxMullerFigure().update(*frame).draw()
+
+
+def benchmark(n_frames=30, samples_per_frame=20_000, gif=None):
+    template = BoxMullerFigure()
+
+    def template_frame(frame):
+        template.update(*frame).draw()
+
+    print(f"{n_frames} frames, {samples_per_frame:,} new samples per frame")
+    for name, render in (("rebuild per frame", rebuild_frame), ("cached template", template_frame)):
+        times = time_frames(render, n_frames, samples_per_frame)
+        print(f"  {name:>18}: {times.mean() * 1e3:7.1f} ms/frame (median {np.median(times) * 1e3:.1f} ms)")
+
+    if gif:
+        from matplotlib.animation import PillowWriter
+
+        writer = PillowWriter(fps=10)
+        with writer.saving(template.fig, gif, dpi=50):
+            for frame in convergence_frames(n_frames, samples_per_frame):
+                template.update(*frame)
+                writer.grab_frame()
+        print(f"Animation saved to {gif}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-frame render time of the Box-Muller figure")
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--samples-per-frame", type=int, default=20_000)
+    parser.add_argument("--gif", help="Also write the convergence animation to this GIF")
+    args = parser.parse_args()
+
+    benchmark(args.frames, args.samples_per_frame, args.gif)
@@ -0,0 +1,58 @@
+import sys
+import time
+
+import numpy as np
+
+from box_muller_sampler import generate_samples, iter_sample_chunks
+
+
+def generate_samples_loop(n_samples=10000):
+    """Reference per-sample loop (the original generate_samples)"""
+    u1_samples = []
+    u2_samples = []
+    z1_samples = []
+    z2_samples = []
+
+    for _ in range(n_samples):
+        u1 = np.random.uniform(0, 1)
+        u2 = np.random.uniform(0, 1)
+        z1 = np.sqrt(-2 * np.log(u1)) * np.cos(2 * np.pi * u2)
+        z2 = np.sqrt(-2 * np.log(u1)) * np.sin(2 * np.pi * u2)
+
+        u1_samples.append(u1)
+        u2_samples.append(u2)
+        z1_samples.append(z1)
+        z2_samples.append(z2)
+
+    return np.array(u1_samples), np.array(u2_samples), np.array(z1_samples), np.array(z2_samples)
+
+
+def best_of(fn, repeats=3):
+    """Best wall-clock time in seconds over a few runs"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark(sizes=(1_000, 10_000, 100_000), chunked_samples=10**8):
+    print(f"{'n_samples':>12} {'loop (s)':>10} {'vectorized (s)':>15} {'speedup':>9}")
+    for n in sizes:
+        loop = best_of(lambda: generate_samples_loop(n), repeats=1)
+        vec = best_of(lambda: generate_samples(n, rng=0))
+        print(f"{n:>12,} {loop:>10.4f} {vec:>15.6f} {loop / vec:>8.0f}x")
+
+    # Chunked generation keeps memory at 4 * chunk_size floats
+    start = time.perf_counter()
+    total = 0.0
+    for _, _, z1, _ in iter_sample_chunks(chunked_samples, rng=0):
+        total += z1.sum()
+    elapsed = time.perf_counter() - start
+    print(f"\nChunked: {chunked_samples:,} samples in {elapsed:.2f}s "
+          f"({chunked_samples / elapsed / 1e6:.1f} M samples/s), mean(Z1) = {total / chunked_samples:+.5f}")
+
+
+if __name__ == "__main__":
+    benchmark(chunked_samples=int(float(sys.argv[1])) if len(sys.argv) > 1 else 10**8)
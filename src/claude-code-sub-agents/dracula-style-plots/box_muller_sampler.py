@@ -0,0 +1,119 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def box_muller_transform(u1, u2, z1=None, z2=None):
+    """Vectorized Box-Muller transform of uniform arrays into standard normals
+
+    u1 must lie in (0, 1]. sqrt(-2 ln u1) is computed once and shared by
+    both outputs. If z1/z2 are given the results are written into them.
+    """
+    radius = np.log(u1)
+    radius *= -2.0
+    np.sqrt(radius, out=radius)
+
+    theta = np.multiply(u2, 2 * np.pi)
+
+    z1 = np.cos(theta, out=z1)
+    z1 *= radius
+    z2 = np.sin(theta, out=z2)
+    z2 *= radius
+    return z1, z2
+
+
+def fill_samples(rng, u1, u2, z1, z2):
+    """Fill preallocated arrays with uniforms and their Box-Muller normals"""
+    rng.random(out=u1)
+    np.subtract(1.0, u1, out=u1)  # [0, 1) -> (0, 1] so log(u1) is finite
+    rng.random(out=u2)
+    box_muller_transform(u1, u2, z1, z2)
+
+
+def generate_samples(n_samples=10000, rng=None):
+    """Generate samples using a vectorized Box-Muller transform
+
+    Returns (u1, u2, z1, z2) like the loop version in box_muller_visualization.
+    rng may be a np.random.Generator or a seed.
+    """
+    rng = np.random.default_rng(rng)
+    u1, u2, z1, z2 = (np.empty(n_samples) for _ in range(4))
+    fill_samples(rng, u1, u2, z1, z2)
+    return u1, u2, z1, z2
+
+
+def iter_sample_chunks(n_samples, chunk_size=DEFAULT_CHUNK_SIZE, rng=None):
+    """Yield (u1, u2, z1, z2) chunks covering n_samples with bounded memory
+
+    The same four buffers are reused for every chunk, so consume (or copy)
+    each chunk before advancing the iterator. Memory stays at
+    4 * chunk_size floats regardless of n_samples.
+    """
+    rng = np.random.default_rng(rng)
+    buffers = [np.empty(min(chunk_size, n_samples)) for _ in range(4)]
+
+    remaining = n_samples
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        chunk = [buf[:n] for buf in buffers]
+        fill_samples(rng, *chunk)
+        yield tuple(chunk)
+        remaining -= n
+
+
+def _fill_shared_range(shm_name, n_samples, start, stop, seed_seq, chunk_size):
+    """Worker: fill samples[start:stop] of the shared (4, n_samples) block"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        samples = np.ndarray((4, n_samples), dtype=np.float64, buffer=shm.buf)
+        rng = np.random.default_rng(seed_seq)
+        for lo in range(start, stop, chunk_size):
+            hi = min(lo + chunk_size, stop)
+            fill_samples(rng, *(row[lo:hi] for row in samples))
+        del samples
+    finally:
+        shm.close()
+
+
+def generate_samples_parallel(n_samples, seed=None, n_workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Generate Box-Muller samples on all cores via shared memory
+
+    Worker i fills the contiguous slice [i*n/w, (i+1)*n/w) from the i-th
+    stream of SeedSequence(seed).spawn(n_workers), writing straight into a
+    shared-memory block so no sample arrays are pickled between processes.
+    The output is bit-for-bit reproducible for a given
+    (seed, n_workers, chunk_size).
+
+    Returns (u1, u2, z1, z2) like generate_samples. The arrays are copied
+    out of the shared block once so they stay valid after it is unlinked.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    streams = seed_seq.spawn(n_workers)
+    bounds = [i * n_samples // n_workers for i in range(n_workers + 1)]
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, 4 * n_samples * 8))
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [
+                pool.submit(_fill_shared_range, shm.name, n_samples,
+                            bounds[i], bounds[i + 1], streams[i], chunk_size)
+                for i in range(n_workers)
+                if bounds[i] < bounds[i + 1]
+            ]
+            for future in futures:
+                future.result()
+
+        shared = np.ndarray((4, n_samples), dtype=np.float64, buffer=shm.buf)
+        samples = shared.copy()
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+    u1, u2, z1, z2 = samples
+    return u1, u2, z1, z2
@@ -0,0 +1,161 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from box_muller_sampler import DEFAULT_CHUNK_SIZE, iter_sample_chunks
+
+
+class FixedHistogram:
+    """Histogram with fixed, evenly spaced bins that can be filled in chunks"""
+
+    def __init__(self, lo, hi, bins=50):
+        self.edges = np.linspace(lo, hi, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    @property
+    def centers(self):
+        return 0.5 * (self.edges[:-1] + self.edges[1:])
+
+    @property
+    def width(self):
+        return self.edges[1] - self.edges[0]
+
+    @property
+    def total(self):
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    def update(self, x):
+        lo, hi = self.edges[0], self.edges[-1]
+        bins = len(self.counts)
+        idx = np.floor((x - lo) * (bins / (hi - lo))).astype(np.int64)
+        # Values exactly at the upper edge belong to the last bin (like np.histogram)
+        idx[x == hi] = bins - 1
+        below = idx < 0
+        above = idx >= bins
+        self.underflow += int(below.sum())
+        self.overflow += int(above.sum())
+        inside = idx[~(below | above)]
+        self.counts += np.bincount(inside, minlength=bins)
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bin edges")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def density(self):
+        """Counts normalised by all samples seen (including out-of-range ones)"""
+        return self.counts / (max(self.total, 1) * self.width)
+
+
+class SampleStats:
+    """Single-pass, mergeable summary of Box-Muller (u1, u2, z1, z2) samples
+
+    Keeps count, means, second central moments and the Z1/Z2 co-moment
+    (Welford's update, combined per chunk with Chan et al.'s parallel
+    formula) plus fixed-bin histograms of all four variables. Results from
+    chunks or workers combine exactly with merge().
+    """
+
+    def __init__(self, bins=50, z_range=(-4.0, 4.0)):
+        self.n = 0
+        self.mean = np.zeros(2)   # Z1, Z2
+        self.m2 = np.zeros(2)     # sum of squared deviations
+        self.c12 = 0.0            # sum of Z1/Z2 cross deviations
+        self.hist_u1 = FixedHistogram(0.0, 1.0, bins)
+        self.hist_u2 = FixedHistogram(0.0, 1.0, bins)
+        self.hist_z1 = FixedHistogram(*z_range, bins)
+        self.hist_z2 = FixedHistogram(*z_range, bins)
+
+    def _combine(self, n_b, mean_b, m2_b, c12_b):
+        n_a = self.n
+        n = n_a + n_b
+        if n_b == 0:
+            return
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (n_b / n)
+        self.m2 = self.m2 + m2_b + delta ** 2 * (n_a * n_b / n)
+        self.c12 = self.c12 + c12_b + delta[0] * delta[1] * (n_a * n_b / n)
+        self.n = n
+
+    def update(self, u1, u2, z1, z2):
+        """Fold one chunk of samples into the running summary"""
+        n_b = len(z1)
+        if n_b == 0:
+            return self
+        mean_b = np.array([z1.mean(), z2.mean()])
+        d1 = z1 - mean_b[0]
+        d2 = z2 - mean_b[1]
+        m2_b = np.array([np.dot(d1, d1), np.dot(d2, d2)])
+        c12_b = float(np.dot(d1, d2))
+        self._combine(n_b, mean_b, m2_b, c12_b)
+
+        self.hist_u1.update(u1)
+        self.hist_u2.update(u2)
+        self.hist_z1.update(z1)
+        self.hist_z2.update(z2)
+        return self
+
+    def merge(self, other):
+        """Combine another summary (e.g. from a parallel worker) into this one"""
+        self._combine(other.n, other.mean, other.m2, other.c12)
+        self.hist_u1.merge(other.hist_u1)
+        self.hist_u2.merge(other.hist_u2)
+        self.hist_z1.merge(other.hist_z1)
+        self.hist_z2.merge(other.hist_z2)
+        return self
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1) of Z1, Z2"""
+        if self.n < 2:
+            return np.full(2, np.nan)
+        return np.sqrt(self.m2 / (self.n - 1))
+
+    @property
+    def corr(self):
+        """Pearson correlation of Z1 and Z2"""
+        denom = np.sqrt(self.m2[0] * self.m2[1])
+        return self.c12 / denom if denom > 0 else np.nan
+
+    @classmethod
+    def from_chunks(cls, chunks, **kwargs):
+        stats = cls(**kwargs)
+        for chunk in chunks:
+            stats.update(*chunk)
+        return stats
+
+
+def _summarize_stream(n_samples, seed_seq, chunk_size, kwargs):
+    """Worker: summarize n_samples drawn from one SeedSequence stream"""
+    rng = np.random.default_rng(seed_seq)
+    return SampleStats.from_chunks(iter_sample_chunks(n_samples, chunk_size, rng), **kwargs)
+
+
+def summarize_parallel(n_samples, seed=None, n_workers=None, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """Summarize n_samples Box-Muller draws across processes
+
+    Each worker streams its share in chunks from its own
+    SeedSequence(seed).spawn(n_workers) stream and returns only a small
+    SampleStats, so billions of samples never need to be materialized.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    streams = seed_seq.spawn(n_workers)
+    shares = [(i + 1) * n_samples // n_workers - i * n_samples // n_workers for i in range(n_workers)]
+
+    total = SampleStats(**kwargs)
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [
+            pool.submit(_summarize_stream, share, stream, chunk_size, kwargs)
+            for share, stream in zip(shares, streams)
+            if share > 0
+        ]
+        for future in futures:
+            total.merge(future.result())
+    return total
@@ -1,184 +1,63 @@
+import argparse
+
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from scipy import stats
 
-# Dracula theme colors
-BG_COLOR = '#282a36'  # Dark background
-FG_COLOR = '#f8f8f2'  # Light foreground text
-PURPLE   = '#BD93F9'  # Primary color
-ORANGE   = '#FFB86C'  # Secondary color
-PINK     = '#FF79C6'  # Tertiary color
-GREEN    = '#50FA7B'  # Additional color
-CYAN     = '#8BE9FD'  # Additional color
-
-plt.rcParams.update(
-    {
-        "figure.facecolor": BG_COLOR,
-        "axes.facecolor"  : BG_COLOR,
-        "axes.edgecolor"  : FG_COLOR,
-        "axes.labelcolor" : FG_COLOR,
-        "xtick.color"     : FG_COLOR,
-        "ytick.color"     : FG_COLOR,
-        "text.color"      : FG_COLOR,
-        "axes.prop_cycle" : plt.cycler(color=[PURPLE, ORANGE, PINK, CYAN, GREEN]),
-        "grid.color"      : FG_COLOR,
-        "grid.alpha"      : 0.3,
-        "grid.linestyle"  : "--",
-    }
-)
-
-def style_axes(ax, edgecolor=FG_COLOR, linewidth=1.2):
-    ax.set_facecolor(BG_COLOR)
-    ax.tick_params(colors=FG_COLOR)
-    for spine in ax.spines.values():
-        spine.set_color(FG_COLOR)
-    for patch in ax.patches:
-        if hasattr(patch, "get_facecolor"):
-            face = patch.get_facecolor()
-            patch.set_edgecolor(edgecolor or face)
-            patch.set_linewidth(linewidth)
-
-def box_muller():
-    """Box-Muller transform to convert uniform random variables to normal"""
-    u1 = np.random.uniform(0, 1)
-    u2 = np.random.uniform(0, 1)
-    z1 = np.sqrt(-2 * np.log(u1)) * np.cos(2 * np.pi * u2)
-    z2 = np.sqrt(-2 * np.log(u1)) * np.sin(2 * np.pi * u2)
-    return z1, z2
-
-def generate_samples(n_samples=10000):
-    """Generate samples using Box-Muller transform"""
-    u1_samples = []
-    u2_samples = []
-    z1_samples = []
-    z2_samples = []
-    
-    for _ in range(n_samples):
-        u1 = np.random.uniform(0, 1)
-        u2 = np.random.uniform(0, 1)
-        z1 = np.sqrt(-2 * np.log(u1)) * np.cos(2 * np.pi * u2)
-        z2 = np.sqrt(-2 * np.log(u1)) * np.sin(2 * np.pi * u2)
-        
-        u1_samples.append(u1)
-        u2_samples.append(u2)
-        z1_samples.append(z1)
-        z2_samples.append(z2)
-    
-    return np.array(u1_samples), np.array(u2_samples), np.array(z1_samples), np.array(z2_samples)
-
-def create_visualization():
-    """Create comprehensive Box-Muller visualization"""
-    # Set random seed for reproducibility
-    np.random.seed(42)
-    
-    # Generate samples
-    n_samples = 10000
-    u1, u2, z1, z2 = generate_samples(n_samples)
-    
-    # Create figure with subplots
-    fig = plt.figure(figsize=(16, 12))
-    
-    # Create a 3x3 grid for comprehensive visualization
-    gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
-    
-    # 1. Input uniform distributions
-    ax1 = fig.add_subplot(gs[0, 0])
-    ax1.hist(u1, bins=50, alpha=0.7, color=PURPLE, edgecolor=FG_COLOR, linewidth=0.8)
-    ax1.axhline(y=n_samples/50, color=ORANGE, linestyle='--', linewidth=2, 
-                label='Theoretical uniform')
-    ax1.set_title('Input U1 ~ Uniform(0,1)', fontsize=12, fontweight='bold')
-    ax1.set_xlabel('Value')
-    ax1.set_ylabel('Frequency')
-    ax1.legend()
-    ax1.grid(True)
-    style_axes(ax1)
-    
-    ax2 = fig.add_subplot(gs[0, 1])
-    ax2.hist(u2, bins=50, alpha=0.7, color=PINK, edgecolor=FG_COLOR, linewidth=0.8)
-    ax2.axhline(y=n_samples/50, color=ORANGE, linestyle='--', linewidth=2,
-                label='Theoretical uniform')
-    ax2.set_title('Input U2 ~ Uniform(0,1)', fontsize=12, fontweight='bold')
-    ax2.set_xlabel('Value')
-    ax2.set_ylabel('Frequency')
-    ax2.legend()
-    ax2.grid(True)
-    style_axes(ax2)
-    
-    # 2. 2D scatter of uniform inputs
-    ax3 = fig.add_subplot(gs[0, 2])
-    ax3.scatter(u1[:1000], u2[:1000], alpha=0.6, s=10, color=CYAN)
-    ax3.set_title('Joint Distribution of U1, U2', fontsize=12, fontweight='bold')
-    ax3.set_xlabel('U1')
-    ax3.set_ylabel('U2')
-    ax3.grid(True)
-    style_axes(ax3)
-    
-    # 3. Output normal distributions
-    ax4 = fig.add_subplot(gs[1, 0])
-    n, bins, patches = ax4.hist(z1, bins=50, alpha=0.7, color=GREEN, 
-                                edgecolor=FG_COLOR, linewidth=0.8, density=True)
-    # Overlay theoretical normal distribution
-    x = np.linspace(-4, 4, 100)
-    y = stats.norm.pdf(x, 0, 1)
-    ax4.plot(x, y, color=ORANGE, linewidth=3, label='Theoretical N(0,1)')
-    ax4.set_title('Output Z1 ~ Normal(0,1)', fontsize=12, fontweight='bold')
-    ax4.set_xlabel('Value')
-    ax4.set_ylabel('Density')
-    ax4.legend()
-    ax4.grid(True)
-    style_axes(ax4)
-    
-    ax5 = fig.add_subplot(gs[1, 1])
-    n, bins, patches = ax5.hist(z2, bins=50, alpha=0.7, color=CYAN, 
-                                edgecolor=FG_COLOR, linewidth=0.8, density=True)
-    ax5.plot(x, y, color=ORANGE, linewidth=3, label='Theoretical N(0,1)')
-    ax5.set_title('Output Z2 ~ Normal(0,1)', fontsize=12, fontweight='bold')
-    ax5.set_xlabel('Value')
-    ax5.set_ylabel('Density')
-    ax5.legend()
-    ax5.grid(True)
-    style_axes(ax5)
-    
-    # 4. 2D scatter of normal outputs
-    ax6 = fig.add_subplot(gs[1, 2])
-    ax6.scatter(z1[:1000], z2[:1000], alpha=0.6, s=10, color=PURPLE)
-    ax6.set_title('Joint Distribution of Z1, Z2', fontsize=12, fontweight='bold')
-    ax6.set_xlabel('Z1')
-    ax6.set_ylabel('Z2')
-    ax6.grid(True)
-    style_axes(ax6)
-    
-    # 5. Q-Q plots for normality check
-    ax7 = fig.add_subplot(gs[2, 0])
-    stats.probplot(z1, dist="norm", plot=ax7)
-    ax7.get_lines()[0].set_markerfacecolor(GREEN)
-    ax7.get_lines()[0].set_markeredgecolor(FG_COLOR)
-    ax7.get_lines()[1].set_color(ORANGE)
-    ax7.get_lines()[1].set_linewidth(2)
-    ax7.set_title('Q-Q Plot: Z1 vs Normal', fontsize=12, fontweight='bold')
-    ax7.grid(True)
-    style_axes(ax7)
-    
-    ax8 = fig.add_subplot(gs[2, 1])
-    stats.probplot(z2, dist="norm", plot=ax8)
-    ax8.get_lines()[0].set_markerfacecolor(CYAN)
-    ax8.get_lines()[0].set_markeredgecolor(FG_COLOR)
-    ax8.get_lines()[1].set_color(ORANGE)
-    ax8.get_lines()[1].set_linewidth(2)
-    ax8.set_title('Q-Q Plot: Z2 vs Normal', fontsize=12, fontweight='bold')
-    ax8.grid(True)
-    style_axes(ax8)
-    
-    # 6. Statistical summary
-    ax9 = fig.add_subplot(gs[2, 2])
-    ax9.axis('off')
-    
-    # Calculate statistics
-    z1_mean, z1_std = np.mean(z1), np.std(z1, ddof=1)
-    z2_mean, z2_std = np.mean(z2), np.std(z2, ddof=1)
-    
-    stats_text = f"""
-    Statistical Summary (n={n_samples:,})
+from box_muller_sampler import iter_sample_chunks
+from box_muller_stats import SampleStats
+from dracula_theme import (BG_COLOR, FG_COLOR, PURPLE, ORANGE, PINK, GREEN, CYAN,
+                           TemplateCache, style_axes)
+import dracula_theme
+
+# Registered style sheet: parsed once, applied once
+dracula_theme.use()
+
+def _filliben(ranks, n):
+    positions = (ranks + 1 - 0.3175) / (n + 0.365)
+    positions[ranks == n - 1] = 0.5 ** (1.0 / n)
+    positions[ranks == 0] = 1 - 0.5 ** (1.0 / n)
+    return positions
+
+def qq_points(values, n_points=500, tail=10, n=None, low=None, high=None):
+    """Decimated normal Q-Q points that preserve the sample quantiles
+
+    Instead of sorting and plotting every sample (as stats.probplot does),
+    pick ~n_points order statistics evenly spread over the ranks, plus the
+    `tail` most extreme ones on each side, with np.partition. Theoretical
+    quantiles use the same Filliben plotting positions as probplot.
+
+    When values is a subsample of a run of n samples, pass n and the run's
+    exact extremes (sorted low/high, as kept by RunSample): the body comes
+    from quantiles of the subsample and the tails from the extremes.
+    """
+    if n is None or n == len(values) or low is None:
+        n = len(values)
+        ranks = np.unique(np.concatenate([
+            np.arange(min(tail, n)),
+            n - 1 - np.arange(min(tail, n)),
+            np.round(np.linspace(0, n - 1, min(n_points, n))).astype(np.int64),
+        ]))
+        ordered = np.partition(values, ranks)[ranks]
+        return stats.norm.ppf(_filliben(ranks, n)), ordered
+
+    k = len(low)
+    # A subsample of m points only resolves ranks about n/m in from either end
+    edge = max(k, n // len(values))
+    body = np.unique(np.round(np.linspace(edge, n - 1 - edge, n_points)).astype(np.int64))
+    ranks = np.concatenate([np.arange(k), body, np.arange(n - k, n)])
+    ordered = np.concatenate([low, np.quantile(values, body / (n - 1)), high])
+    return stats.norm.ppf(_filliben(ranks, n)), ordered
+
+def format_summary(summary):
+    """Text for the statistical summary panel"""
+    z1_mean, z2_mean = summary.mean
+    z1_std, z2_std = summary.std
+    
+    return f"""
+    Statistical Summary (n={summary.n:,})
     
     Z1 Statistics:
     Mean: {z1_mean:.4f} (theoretical: 0.0000)
@@ -188,24 +67,284 @@ def create_visualization():
     Mean: {z2_mean:.4f} (theoretical: 0.0000)
     Std:  {z2_std:.4f} (theoretical: 1.0000)
     
-    Correlation(Z1, Z2): {np.corrcoef(z1, z2)[0,1]:.4f}
+    Correlation(Z1, Z2): {summary.corr:.4f}
     (theoretical: 0.0000)
     
     Box-Muller Transform:
     Z1 = √(-2ln(U1)) × cos(2πU2)
     Z2 = √(-2ln(U1)) × sin(2πU2)
     """
+
+def _padded(lo, hi, margin=0.05):
+    pad = (hi - lo) * margin or 0.5
+    return lo - pad, hi + pad
+
+class BoxMullerFigure:
+    """The 3x3 Box-Muller figure, built once and updated in place
+
+    All axes, bars, scatter collections, Q-Q lines and the summary text are
+    created (and styled) in __init__; update() only swaps artist data, so
+    re-rendering for a new set of samples skips figure construction.
+    """
+    
+    def __init__(self, bins=50, z_range=(-4.0, 4.0), scatter_points=1000,
+                 qq_points_per_panel=500, rasterized=False, headless=True):
+        self.scatter_points = scatter_points
+        self.qq_points_per_panel = qq_points_per_panel
+        
+        # Create figure with subplots (headless figures never touch pyplot);
+        # constrained layout is solved once, on the first update (see _fit_layout)
+        if headless:
+            self.fig = Figure(figsize=(16, 12), layout='constrained')
+            FigureCanvasAgg(self.fig)
+        else:
+            self.fig = plt.figure(figsize=(16, 12), layout='constrained')
+        fig = self.fig
+        
+        # Create a 3x3 grid for comprehensive visualization
+        gs = fig.add_gridspec(3, 3)
+        u_edges = np.linspace(0.0, 1.0, bins + 1)
+        z_edges = np.linspace(*z_range, bins + 1)
+        
+        # 1. Input uniform distributions
+        self.ax_u1, self.bars_u1, self.ref_u1 = self._uniform_hist(
+            fig.add_subplot(gs[0, 0]), u_edges, PURPLE, 'Input U1 ~ Uniform(0,1)')
+        self.ax_u2, self.bars_u2, self.ref_u2 = self._uniform_hist(
+            fig.add_subplot(gs[0, 1]), u_edges, PINK, 'Input U2 ~ Uniform(0,1)')
+        
+        # 2. 2D scatter of uniform inputs
+        self.ax_uu, self.scatter_uu = self._scatter(
+            fig.add_subplot(gs[0, 2]), CYAN, 'Joint Distribution of U1, U2', 'U1', 'U2', rasterized)
+        self.ax_uu.set_xlim(_padded(0.0, 1.0))
+        self.ax_uu.set_ylim(_padded(0.0, 1.0))
+        
+        # 3. Output normal distributions
+        self.ax_z1, self.bars_z1 = self._normal_hist(
+            fig.add_subplot(gs[1, 0]), z_edges, GREEN, 'Output Z1 ~ Normal(0,1)')
+        self.ax_z2, self.bars_z2 = self._normal_hist(
+            fig.add_subplot(gs[1, 1]), z_edges, CYAN, 'Output Z2 ~ Normal(0,1)')
+        
+        # 4. 2D scatter of normal outputs
+        self.ax_zz, self.scatter_zz = self._scatter(
+            fig.add_subplot(gs[1, 2]), PURPLE, 'Joint Distribution of Z1, Z2', 'Z1', 'Z2', rasterized)
+        
+        # 5. Q-Q plots for normality check
+        self.ax_qq1, self.qq1_points, self.qq1_fit = self._qq(
+            fig.add_subplot(gs[2, 0]), GREEN, 'Q-Q Plot: Z1 vs Normal', rasterized)
+        self.ax_qq2, self.qq2_points, self.qq2_fit = self._qq(
+            fig.add_subplot(gs[2, 1]), CYAN, 'Q-Q Plot: Z2 vs Normal', rasterized)
+        
+        # 6. Statistical summary
+        ax9 = fig.add_subplot(gs[2, 2])
+        ax9.axis('off')
+        self.summary_text = ax9.text(
+            0.05, 0.95, '', transform=ax9.transAxes, fontsize=10,
+            verticalalignment='top', fontfamily='monospace',
+            bbox=dict(boxstyle='round', facecolor=BG_COLOR, edgecolor=FG_COLOR, alpha=0.8))
+        
+        # Main title
+        fig.suptitle('Box-Muller Transform: Converting Uniform to Normal Distributions', 
+                     fontsize=16, fontweight='bold')
+    
+    @staticmethod
+    def _finish_axes(ax, title, xlabel, ylabel):
+        ax.set_title(title, fontsize=12, fontweight='bold')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.grid(True)
+        style_axes(ax)
+    
+    def _bars(self, ax, edges, color):
+        centers = 0.5 * (edges[:-1] + edges[1:])
+        bars = ax.bar(centers, np.zeros(len(centers)), width=edges[1] - edges[0], alpha=0.7,
+                      color=color, edgecolor=FG_COLOR, linewidth=0.8)
+        ax.set_xlim(_padded(edges[0], edges[-1]))
+        return bars
+    
+    def _uniform_hist(self, ax, edges, color, title):
+        bars = self._bars(ax, edges, color)
+        ref = ax.axhline(y=0, color=ORANGE, linestyle='--', linewidth=2, 
+                         label='Theoretical uniform')
+        ax.legend()
+        self._finish_axes(ax, title, 'Value', 'Frequency')
+        return ax, bars, ref
+    
+    def _normal_hist(self, ax, edges, color, title):
+        bars = self._bars(ax, edges, color)
+        # Overlay theoretical normal distribution
+        x = np.linspace(-4, 4, 100)
+        ax.plot(x, stats.norm.pdf(x, 0, 1), color=ORANGE, linewidth=3, label='Theoretical N(0,1)')
+        ax.legend()
+        self._finish_axes(ax, title, 'Value', 'Density')
+        return ax, bars
+    
+    def _scatter(self, ax, color, title, xlabel, ylabel, rasterized):
+        scatter = ax.scatter([], [], alpha=0.6, s=10, color=color, rasterized=rasterized)
+        self._finish_axes(ax, title, xlabel, ylabel)
+        return ax, scatter
+    
+    def _qq(self, ax, color, title, rasterized):
+        points, = ax.plot([], [], 'o', markerfacecolor=color, markeredgecolor=FG_COLOR,
+                          rasterized=rasterized)
+        fit, = ax.plot([], [], color=ORANGE, linewidth=2)
+        self._finish_axes(ax, title, 'Theoretical quantiles', 'Ordered Values')
+        return ax, points, fit
+    
+    @staticmethod
+    def _set_bars(ax, bars, heights, reference):
+        for bar, height in zip(bars, heights):
+            bar.set_height(height)
+        ax.set_ylim(0, max(heights.max(), reference) * 1.05)
+    
+    def _set_qq(self, ax, points, fit, values, mean, std, n=None, low=None, high=None):
+        theoretical, ordered = qq_points(values, self.qq_points_per_panel, n=n, low=low, high=high)
+        points.set_data(theoretical, ordered)
+        ends = theoretical[[0, -1]]
+        fit.set_data(ends, mean + std * ends)
+        ax.set_xlim(_padded(theoretical[0], theoretical[-1]))
+        ax.set_ylim(_padded(min(ordered[0], fit.get_ydata()[0]), max(ordered[-1], fit.get_ydata()[-1])))
+    
+    def update(self, summary, u1, u2, z1, z2, run=None):
+        """Point every artist at new data (summary covers all samples, arrays a subset)
+
+        Pass the RunSample the arrays came from so the Q-Q tails use the
+        run's exact extremes; the scatter panels take an even stride of the
+        arrays rather than their first points.
+        """
+        for bars in (self.bars_u1, self.bars_u2, self.bars_z1, self.bars_z2):
+            if len(bars) != len(summary.hist_u1.counts):
+                raise ValueError("SampleStats bins do not match the figure template")
+        
+        expected = summary.n / len(summary.hist_u1.counts)
+        self.ref_u1.set_ydata([expected, expected])
+        self.ref_u2.set_ydata([expected, expected])
+        self._set_bars(self.ax_u1, self.bars_u1, summary.hist_u1.counts, expected)
+        self._set_bars(self.ax_u2, self.bars_u2, summary.hist_u2.counts, expected)
+        self._set_bars(self.ax_z1, self.bars_z1, summary.hist_z1.density(), 0.4)
+        self._set_bars(self.ax_z2, self.bars_z2, summary.hist_z2.density(), 0.4)
+        
+        k = self.scatter_points
+        every = slice(None, None, max(1, -(-len(z1) // k)))
+        su1, su2, sz1, sz2 = u1[every], u2[every], z1[every], z2[every]
+        self.scatter_uu.set_offsets(np.column_stack([su1, su2]))
+        self.scatter_zz.set_offsets(np.column_stack([sz1, sz2]))
+        self.ax_zz.set_xlim(_padded(sz1.min(), sz1.max()))
+        self.ax_zz.set_ylim(_padded(sz2.min(), sz2.max()))
+        
+        tails = [{}, {}] if run is None else [
+            {'n': run.n, 'low': run.low[i], 'high': run.high[i]} for i in range(2)]
+        self._set_qq(self.ax_qq1, self.qq1_points, self.qq1_fit, z1, summary.mean[0], summary.std[0], **tails[0])
+        self._set_qq(self.ax_qq2, self.qq2_points, self.qq2_fit, z2, summary.mean[1], summary.std[1], **tails[1])
+        
+        self.summary_text.set_text(format_summary(summary))
+        self._fit_layout()
+        return self
+    
+    def _fit_layout(self):
+        """Solve constrained layout for the first data, then freeze it
+
+        Like the one-off tight_layout() it replaces: re-solving on every
+        draw would cost more than updating the artists.
+        """
+        engine = self.fig.get_layout_engine()
+        if engine is not None and engine.adjust_compatible is False:
+            engine.execute(self.fig)
+            self.fig.set_layout_engine('none')
+    
+    def draw(self):
+        """Render the current state to the canvas (one animation frame)"""
+        self.fig.canvas.draw()
+    
+    def save(self, output):
+        self.fig.savefig(output)
+        return output
+
+# Headless templates are reused across renders
+_templates = TemplateCache()
+
+class RunSample:
+    """Bounded view of a streamed run for the scatter and Q-Q panels
+
+    Keeps every step-th sample across all chunks (about `size` points) and
+    the exact `tail` smallest and largest Z1/Z2 values, so the point panels
+    represent the whole run rather than its first chunk.
+    """
+    
+    def __init__(self, n_total, size=50_000, tail=10):
+        self.step = max(1, -(-n_total // size))
+        self.tail = tail
+        self.n = 0
+        self.low = [np.empty(0), np.empty(0)]
+        self.high = [np.empty(0), np.empty(0)]
+        self._parts = []
+    
+    def update(self, u1, u2, z1, z2):
+        every = slice((-self.n) % self.step, None, self.step)
+        self._parts.append(tuple(values[every].copy() for values in (u1, u2, z1, z2)))
+        for i, z in enumerate((z1, z2)):
+            k = min(self.tail, len(z))
+            chunk_low = np.partition(z, k - 1)[:k]
+            chunk_high = np.partition(z, len(z) - k)[len(z) - k:]
+            self.low[i] = np.sort(np.concatenate([self.low[i], chunk_low]))[:self.tail]
+            self.high[i] = np.sort(np.concatenate([self.high[i], chunk_high]))[-self.tail:]
+        self.n += len(z1)
+        return self
     
-    ax9.text(0.05, 0.95, stats_text, transform=ax9.transAxes, fontsize=10,
-             verticalalignment='top', fontfamily='monospace',
-             bbox=dict(boxstyle='round', facecolor=BG_COLOR, edgecolor=FG_COLOR, alpha=0.8))
+    def arrays(self):
+        """The strided (u1, u2, z1, z2) subsample"""
+        return tuple(np.concatenate(values) for values in zip(*self._parts))
+
+def stream_samples(n_samples, seed=42, sample_size=50_000):
+    """Stream n_samples into SampleStats and a RunSample of the whole run"""
+    if n_samples < 1:
+        raise ValueError(f"n_samples must be at least 1, got {n_samples}")
+    # Seeded generator for reproducibility
+    rng = np.random.default_rng(seed)
     
-    # Main title
-    fig.suptitle('Box-Muller Transform: Converting Uniform to Normal Distributions', 
-                 fontsize=16, fontweight='bold', y=0.98)
+    summary = SampleStats()
+    run = RunSample(n_samples, sample_size)
+    for chunk in iter_sample_chunks(n_samples, rng=rng):
+        summary.update(*chunk)
+        run.update(*chunk)
+    return summary, run
+
+def create_visualization(n_samples=10000, seed=42, output=None, rasterized=False,
+                         scatter_points=1000, qq_points_per_panel=500):
+    """Create comprehensive Box-Muller visualization
+
+    Samples are streamed in chunks into a SampleStats accumulator, so the
+    histograms and summary panel cover all n_samples with bounded memory.
+    The scatter and Q-Q panels use a strided subsample of the whole run,
+    decimated to scatter_points / qq_points_per_panel points, with the
+    Q-Q tails taken from the run's exact extremes.
+
+    With output set, the figure is rendered headless (Agg, no pyplot) to
+    that path (.png, .svg, ...) instead of being shown, reusing a cached
+    BoxMullerFigure template across calls. rasterized=True embeds the point
+    layers as images, which keeps SVGs small.
+    """
+    summary, run = stream_samples(n_samples, seed)
+    u1, u2, z1, z2 = run.arrays()
+    
+    if output:
+        key = (rasterized, scatter_points, qq_points_per_panel)
+        template = _templates.get(key, lambda: BoxMullerFigure(
+            scatter_points=scatter_points, qq_points_per_panel=qq_points_per_panel,
+            rasterized=rasterized))
+        return template.update(summary, u1, u2, z1, z2, run).save(output)
     
-    plt.tight_layout()
+    BoxMullerFigure(scatter_points=scatter_points, qq_points_per_panel=qq_points_per_panel,
+                    rasterized=rasterized, headless=False).update(summary, u1, u2, z1, z2, run)
     plt.show()
 
 if __name__ == "__main__":
-    create_visualization()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Box-Muller transform visualization")
+    parser.add_argument("--samples", "-n", type=float, default=10000, help="Number of samples (e.g. 1e6)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", "-o", help="Render headless to this file (.png/.svg) instead of showing")
+    parser.add_argument("--rasterized", action="store_true", help="Rasterize scatter and Q-Q point layers")
+    args = parser.parse_args()
+    if int(args.samples) < 1:
+        parser.error("--samples must be at least 1")
+
+    create_visualization(int(args.samples), args.seed, args.output, args.rasterized)
\ No newline at end of file
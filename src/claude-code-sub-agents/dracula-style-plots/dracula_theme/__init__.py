@@ -0,0 +1,73 @@
+"""Dracula theme for Matplotlib: colors, a registered style sheet and figure templates"""
+
+from pathlib import Path
+
+import matplotlib.style as mplstyle
+
+# Dracula theme colors
+BG_COLOR = '#282a36'  # Dark background
+FG_COLOR = '#f8f8f2'  # Light foreground text
+PURPLE   = '#BD93F9'  # Primary color
+ORANGE   = '#FFB86C'  # Secondary color
+PINK     = '#FF79C6'  # Tertiary color
+GREEN    = '#50FA7B'  # Additional color
+CYAN     = '#8BE9FD'  # Additional color
+
+STYLE_NAME = 'dracula'
+STYLE_PATH = Path(__file__).with_name('dracula.mplstyle')
+
+
+def register_style():
+    """Parse the style sheet once and register it as plt.style 'dracula'"""
+    if STYLE_NAME not in mplstyle.library:
+        mplstyle.library[STYLE_NAME] = mplstyle.rc_params_from_file(
+            STYLE_PATH, use_default_template=False)
+        mplstyle.available[:] = sorted(mplstyle.library)
+    return STYLE_NAME
+
+
+def use():
+    """Register (if needed) and activate the Dracula style globally"""
+    mplstyle.use(register_style())
+
+
+def style_axes(ax, edgecolor=FG_COLOR, linewidth=1.2):
+    """Apply Dracula colors to one axes and outline its patches
+
+    The style sheet already covers faces, ticks and spines; this is only
+    needed for axes created outside the style or patches drawn without an
+    edge color. It walks every patch, so call it once per axes, not per frame.
+    """
+    ax.set_facecolor(BG_COLOR)
+    ax.tick_params(colors=FG_COLOR)
+    for spine in ax.spines.values():
+        spine.set_color(FG_COLOR)
+    for patch in ax.patches:
+        if hasattr(patch, "get_facecolor"):
+            face = patch.get_facecolor()
+            patch.set_edgecolor(edgecolor or face)
+            patch.set_linewidth(linewidth)
+
+
+class TemplateCache:
+    """Build expensive figure templates once and hand back the same instance
+
+    Templates are keyed by anything hashable (e.g. the layout parameters);
+    callers update artist data in place instead of rebuilding the figure.
+    """
+
+    def __init__(self):
+        self._templates = {}
+
+    def get(self, key, builder):
+        """Return the template for key, calling builder() only on first use"""
+        template = self._templates.get(key)
+        if template is None:
+            template = self._templates[key] = builder()
+        return template
+
+    def clear(self):
+        self._templates.clear()
+
+    def __len__(self):
+        return len(self._templates)
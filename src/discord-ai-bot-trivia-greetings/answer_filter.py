@@ -0,0 +1,94 @@
+# answer_filter.py
+import logging
+import re
+from collections import Counter
+
+import discord
+
+logger = logging.getLogger("DiscordBot.AnswerFilter")
+
+# Mentions, custom emoji and links carry no answer on their own
+NOISE_RE = re.compile(r"<a?:\w+:\d+>|<[@#][!&]?\d+>|https?://\S+")
+ALNUM_RE = re.compile(r"[^\W_]")
+
+# Chatter that is never an answer to a trivia question
+NON_ANSWERS = {
+    "hi", "hey", "hello", "yo", "thanks", "thank you", "thx", "ty",
+    "lol", "lmao", "haha", "nice", "cool", "wow", "gm", "gn",
+}
+
+
+def looks_like_answer(content: str) -> bool:
+    """Fast relevance heuristic: some real text that is not bare chatter."""
+    text = NOISE_RE.sub(" ", content)
+    if not ALNUM_RE.search(text):
+        return False
+    if text[:1] in ("!", "/"):
+        return False
+    normalized = " ".join(re.findall(r"[a-z0-9']+", text.lower()))
+    return normalized not in NON_ANSWERS
+
+
+class AnswerFilter:
+    """Decides, without calling the LLM, whether a message answers a pending question.
+
+    A message is only verified if its author has a pending question in the
+    channel, it is not a reply to some other message or posted in an
+    unrelated thread, and it passes looks_like_answer(). Outcomes are
+    counted in self.counts: "verified" or the reason a message was filtered.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.counts = Counter()
+
+    def _reject(self, reason):
+        self.counts[reason] += 1
+        return None
+
+    def match(self, message):
+        """Pending context the message answers, or None if it was filtered out."""
+        if message.author.bot:
+            return self._reject("bot_author")
+
+        channel = message.channel
+        thread_id = None
+        if isinstance(channel, discord.Thread):
+            thread_id = channel.id
+            channel_id = channel.parent_id
+        else:
+            channel_id = channel.id
+
+        # O(1): nothing pending for anyone here, or nothing for this author
+        if not self.store.has_channel(channel_id):
+            return self._reject("no_pending_question")
+        context = self.store.get(channel_id, message.author.id)
+        if context is None:
+            return self._reject("other_author")
+
+        welcome_id = context.get("message_id")
+        # Threads started from a message share that message's id
+        if thread_id is not None and thread_id != welcome_id:
+            return self._reject("unrelated_thread")
+        reference = message.reference
+        replies_to_welcome = reference is not None and reference.message_id == welcome_id
+        if reference is not None and not replies_to_welcome:
+            return self._reject("reply_to_other")
+
+        if not message.content.strip():
+            return self._reject("empty")
+        if not replies_to_welcome and not looks_like_answer(message.content):
+            return self._reject("not_an_answer")
+
+        self.counts["verified"] += 1
+        return context
+
+    @property
+    def filtered(self) -> int:
+        return sum(self.counts.values()) - self.counts["verified"]
+
+    def summary(self) -> str:
+        reasons = ", ".join(
+            f"{reason}: {count}" for reason, count in self.counts.most_common() if reason != "verified"
+        )
+        return f"verified={self.counts['verified']} filtered={self.filtered} [{reasons}]"
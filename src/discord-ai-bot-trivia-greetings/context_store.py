@@ -0,0 +1,190 @@
+# context_store.py
+import asyncio
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("DiscordBot.ContextStore")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS question_context (
+    channel_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    message_id INTEGER,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (channel_id, user_id)
+)
+"""
+
+
+class QuestionContextStore:
+    """Pending trivia questions keyed by (channel_id, user_id).
+
+    Lookups hit an in-memory OrderedDict, so they are O(1) and never touch
+    disk. Entries expire after ttl seconds and the oldest are evicted beyond
+    max_size. Changes are persisted to SQLite by a background write-behind
+    task every flush_interval seconds, off the event loop.
+
+    Several bot processes may share one database file: every guild is served
+    by a single shard, so each process only writes its own keys. Deletes only
+    match the row version this process saw, and max_size bounds memory
+    only; rows evicted from memory stay on disk until they expire.
+    """
+
+    def __init__(self, path="question_context.db", ttl=86400.0, max_size=10000, flush_interval=2.0):
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._entries = OrderedDict()
+        self._by_channel = {}
+        # key -> ("put", entry) or ("delete", entry)
+        self._pending = {}
+        self._flush_lock = asyncio.Lock()
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        # WAL lets shard processes read while another one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(SCHEMA)
+        self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self):
+        now = time.time()
+        with self._conn:
+            self._conn.execute("DELETE FROM question_context WHERE expires_at <= ?", (now,))
+        rows = self._conn.execute(
+            "SELECT channel_id, user_id, question, message_id, expires_at "
+            "FROM question_context ORDER BY expires_at DESC LIMIT ?",
+            (self.max_size,),
+        ).fetchall()
+        for channel_id, user_id, question, message_id, expires_at in reversed(rows):
+            self._insert(
+                (channel_id, user_id),
+                {
+                    "channel_id": channel_id,
+                    "user_id": user_id,
+                    "question": question,
+                    "message_id": message_id,
+                    "expires_at": expires_at,
+                },
+            )
+        logger.info(f"Loaded {len(self)} pending question contexts from {self.path}")
+
+    def _insert(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._by_channel.setdefault(key[0], OrderedDict())[key[1]] = None
+
+    def _remove(self, key, persist=True):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        users = self._by_channel.get(key[0])
+        if users is not None:
+            users.pop(key[1], None)
+            if not users:
+                del self._by_channel[key[0]]
+        if persist:
+            self._pending[key] = ("delete", entry)
+        return entry
+
+    def _evict_overflow(self):
+        while len(self._entries) > self.max_size:
+            key = next(iter(self._entries))
+            logger.debug(f"Evicting question context {key}")
+            self._remove(key, persist=False)
+
+    def _alive(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires_at"] <= time.time():
+            self._remove(key)
+            return None
+        return entry
+
+    def put(self, channel_id, user_id, question, message_id=None):
+        key = (channel_id, user_id)
+        entry = {
+            "channel_id": channel_id,
+            "user_id": user_id,
+            "question": question,
+            "message_id": message_id,
+            "expires_at": time.time() + self.ttl,
+        }
+        self._insert(key, entry)
+        self._pending[key] = ("put", entry)
+        self._evict_overflow()
+        return entry
+
+    def get(self, channel_id, user_id):
+        return self._alive((channel_id, user_id))
+
+    def pop(self, channel_id, user_id):
+        if self._alive((channel_id, user_id)) is None:
+            return None
+        return self._remove((channel_id, user_id))
+
+    def has_channel(self, channel_id) -> bool:
+        return channel_id in self._by_channel
+
+    def sweep(self):
+        """Drop expired entries (oldest first, so stop at the first live one)."""
+        now = time.time()
+        expired = []
+        for key, entry in self._entries.items():
+            if entry["expires_at"] > now:
+                break
+            expired.append(key)
+        for key in expired:
+            self._remove(key)
+        return len(expired)
+
+    def _write(self, batch):
+        upserts = [
+            (e["channel_id"], e["user_id"], e["question"], e["message_id"], e["expires_at"])
+            for op, e in batch.values()
+            if op == "put"
+        ]
+        deletes = [
+            (e["channel_id"], e["user_id"], e["expires_at"]) for op, e in batch.values() if op == "delete"
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM question_context WHERE channel_id = ? AND user_id = ? AND expires_at = ?",
+                deletes,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO question_context "
+                "(channel_id, user_id, question, message_id, expires_at) VALUES (?, ?, ?, ?, ?)",
+                upserts,
+            )
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as e:
+                logger.error(f"Error flushing question contexts: {str(e)}")
+                # Keep the batch for the next flush unless newer changes replaced it
+                self._pending = {**batch, **self._pending}
+
+    async def flush_forever(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.sweep()
+            await self.flush()
+
+    def close(self):
+        """Synchronously write any pending changes and close the database."""
+        if self._pending:
+            self._write(self._pending)
+            self._pending = {}
+        self._conn.close()
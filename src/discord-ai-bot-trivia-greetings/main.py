@@ -1,10 +1,16 @@
 # main.py
+import asyncio
 import logging
 import os
 
 import discord
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+from answer_filter import AnswerFilter
+from context_store import QuestionContextStore
+from metrics import LatencyHistogram, LoopLagMonitor
+from question_pool import QuestionPool
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -55,6 +61,19 @@ Stockfish is indeed a powerful chess engine, but it came after Deep Blue and has
 
 CHANNEL_NAME = "general-chat"
 MODEL = "gpt-4o-mini"
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "30"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+QUESTION_POOL_SIZE = int(os.getenv("QUESTION_POOL_SIZE", "10"))
+QUESTION_CONTEXT_PATH = os.getenv("QUESTION_CONTEXT_PATH", "question_context.db")
+# SQLite file shared by all shard processes; defaults to the context store's
+QUESTION_POOL_PATH = os.getenv("QUESTION_POOL_PATH", QUESTION_CONTEXT_PATH)
+QUESTION_CONTEXT_TTL = float(os.getenv("QUESTION_CONTEXT_TTL", "86400"))
+QUESTION_CONTEXT_MAX = int(os.getenv("QUESTION_CONTEXT_MAX", "10000"))
+# Unset: one gateway connection. "auto" or a number: AutoShardedClient
+DISCORD_SHARD_COUNT = os.getenv("DISCORD_SHARD_COUNT")
+# Comma-separated shard ids run by this process (set by shard_launcher.py)
+DISCORD_SHARD_IDS = os.getenv("DISCORD_SHARD_IDS")
+METRICS_LOG_INTERVAL = float(os.getenv("METRICS_LOG_INTERVAL", "60"))
 PROMPTS = {
     "stage_1": [
         {
@@ -76,33 +95,69 @@ PROMPTS = {
 }
 
 
-# Initialize OpenAI client
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Initialize OpenAI client (async, so LLM calls never block the event loop)
+openai_client = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"), timeout=OPENAI_TIMEOUT, max_retries=2
+)
+
+# Bound the number of in-flight OpenAI requests across all guilds
+openai_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+
+# OpenAI round-trip latency per call type (including time queued on the semaphore)
+openai_latency = {
+    "question": LatencyHistogram(),
+    "verify": LatencyHistogram(),
+}
+
+
+def create_client(intents):
+    if DISCORD_SHARD_COUNT is None and DISCORD_SHARD_IDS is None:
+        return discord.Client(intents=intents)
+    # All shards in this process share one event loop, question pool and context store
+    shard_count = None if DISCORD_SHARD_COUNT in (None, "auto") else int(DISCORD_SHARD_COUNT)
+    shard_ids = [int(i) for i in DISCORD_SHARD_IDS.split(",")] if DISCORD_SHARD_IDS else None
+    return discord.AutoShardedClient(intents=intents, shard_count=shard_count, shard_ids=shard_ids)
+
 
 # Initialize Discord client
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
-client = discord.Client(intents=intents)
+client = create_client(intents)
+
+# Event-loop lag of this process, reported for each shard it runs
+loop_lag = LoopLagMonitor()
 
-# Store question context for verification
-question_context = {}
+# Pre-generated questions so joins are answered instantly
+question_pool = QuestionPool(QUESTION_POOL_PATH, target_size=QUESTION_POOL_SIZE)
 
-# question_context[1338704307951767552] = {
-#     "question": "What is the best ai model in terms of benchmarks in 2024?",
-#     "user_id": 416455497789472768,
-# }
+# Pending questions keyed by (channel_id, user_id), persisted across restarts
+question_context = QuestionContextStore(
+    QUESTION_CONTEXT_PATH, ttl=QUESTION_CONTEXT_TTL, max_size=QUESTION_CONTEXT_MAX
+)
+
+# Filters out messages that cannot be answers before any LLM call
+answer_filter = AnswerFilter(question_context)
+
+
+async def chat_completion(kind, messages) -> str:
+    histogram = openai_latency[kind]
+    with histogram.time():
+        async with openai_semaphore:
+            response = await openai_client.chat.completions.create(
+                model=MODEL,
+                messages=messages,
+            )
+    logger.debug(f"OpenAI {kind} latency: {histogram.summary()}")
+    return response.choices[0].message.content
 
 
 async def generate_ai_question() -> str:
     logger.debug("Generating AI question...")
     try:
-        response = openai_client.chat.completions.create(
-            model=MODEL,
-            messages=PROMPTS["stage_1"],
-        )
-        logger.debug(f"Generated question: {response.choices[0].message.content}")
-        return response.choices[0].message.content
+        question = await chat_completion("question", PROMPTS["stage_1"])
+        logger.debug(f"Generated question: {question}")
+        return question
     except Exception as e:
         logger.error(f"Error generating question: {str(e)}")
         return "Well, this is awkward. It seems that I'm broken right now. Maybe I used all my magic OpenAI API jelly beans. Hopefully Alex can get me online again soon!"
@@ -110,20 +165,50 @@ async def generate_ai_question() -> str:
 
 async def verify_answer(question, user_answer):
     try:
-        response = openai_client.chat.completions.create(
-            model=MODEL,
-            messages=PROMPTS["stage_2"](question, user_answer),
-        )
-        return response.choices[0].message.content
+        return await chat_completion("verify", PROMPTS["stage_2"](question, user_answer))
     except Exception as e:
         logger.error(f"Error verifying answer: {str(e)}")
         return "Thanks for your answer! Due to technical difficulties, I couldn't verify it right now. Go tell Alex to fix me."
 
 
+def shard_latencies():
+    """(shard_id, gateway heartbeat latency) for every shard in this process."""
+    if isinstance(client, discord.AutoShardedClient):
+        return client.latencies
+    return [(0, client.latency)]
+
+
+async def log_metrics_forever():
+    while True:
+        await asyncio.sleep(METRICS_LOG_INTERVAL)
+        lag = loop_lag.summary()
+        for shard_id, heartbeat in shard_latencies():
+            logger.info(f"Shard {shard_id}: heartbeat {heartbeat * 1000:.0f}ms, event-loop lag {lag}")
+        logger.info(f"OpenAI question latency: {openai_latency['question'].summary()}")
+        logger.info(f"OpenAI verify latency: {openai_latency['verify'].summary()}")
+        logger.info(f"Answer filter: {answer_filter.summary()}")
+
+
+async def generate_pool_question() -> str:
+    # Unlike generate_ai_question, errors propagate so the pool never stores the fallback text
+    return await chat_completion("question", PROMPTS["stage_1"])
+
+
+@client.event
+async def setup_hook():
+    # Runs once per process, before connecting to the gateway
+    client.loop.create_task(question_pool.refill_forever(generate_pool_question))
+    client.loop.create_task(question_context.flush_forever())
+    client.loop.create_task(loop_lag.run_forever())
+    client.loop.create_task(log_metrics_forever())
+
+
 @client.event
 async def on_ready():
     logger.info(f"Bot logged in as {client.user}")
     logger.info(f"Bot is in {len(client.guilds)} guilds")
+    if isinstance(client, discord.AutoShardedClient):
+        logger.info(f"Running shards {sorted(client.shards)} of {client.shard_count}")
     for guild in client.guilds:
         logger.info(f"- {guild.name} (id: {guild.id})")
         # List all channels in each guild
@@ -144,51 +229,57 @@ async def on_member_join(member):
     logger.info(f"Using channel: {channel.name} (id: {channel.id})")
 
     try:
-        # Generate AI trivia question
-        question = await generate_ai_question()
-
-        # Store the question context
-        question_context[channel.id] = {"question": question, "user_id": member.id}
+        # Take a pre-generated question, falling back to a live LLM call
+        question = await question_pool.take()
+        if question is None:
+            logger.warning("Question pool is empty, generating a question live")
+            question = await generate_ai_question()
 
         # Send welcome message with question
         logger.info(f"Sending welcome message to channel {channel.id}")
-        logger.info(f"Setting question context {question_context}")
-        await channel.send(
+        welcome = await channel.send(
             f"Welcome {member.mention}! In honor of your arrival, I've come up with a question just for you. Post your best guess and feel free to talk through your reasoning. No cheating!\n\n{question}"
         )
         logger.info("Welcome message sent successfully")
 
+        # Store the question context
+        logger.info(f"Setting question context for member {member.id} in channel {channel.id}")
+        question_context.put(channel.id, member.id, question, message_id=welcome.id)
+
     except Exception as e:
         logger.error(f"Error in on_member_join: {str(e)}", exc_info=True)
 
 
 @client.event
 async def on_message(message):
-    logger.debug(f"Message received in channel {message.channel.id}")
-    logger.debug(f"Current question contexts: {question_context}")
-
     if message.author == client.user:
         # Ignore messages from the bot itself
         return
 
-    if message.channel.id in question_context:
-        logger.info(f"Processing answer for question in channel {message.channel.id}")
-        context = question_context[message.channel.id]
+    # Cheap checks first; only likely answers reach the LLM
+    context = answer_filter.match(message)
+    if context is None:
+        return
 
-        try:
-            # Verify the answer
-            response = await verify_answer(context["question"], message.content)
+    logger.info(f"Processing answer from {message.author.id} in channel {context['channel_id']}")
+    # Claim the question so a quick follow-up message is not verified as well
+    question_context.pop(context["channel_id"], context["user_id"])
 
-            # Tag the original user in the response
-            user = await message.guild.fetch_member(context["user_id"])
-            await message.channel.send(f"{user.mention} {response}")
-            logger.info("Answer response sent successfully")
+    try:
+        # Verify the answer
+        response = await verify_answer(context["question"], message.content)
 
-            # Clear the question context
-            del question_context[message.channel.id]
+        # Tag the original user in the response
+        await message.channel.send(f"{message.author.mention} {response}")
+        logger.info("Answer response sent successfully")
+        logger.info(f"Answer filter: {answer_filter.summary()}")
 
-        except Exception as e:
-            logger.error(f"Error processing answer: {str(e)}", exc_info=True)
+    except Exception as e:
+        logger.error(f"Error processing answer: {str(e)}", exc_info=True)
+        # Let the member try again
+        question_context.put(
+            context["channel_id"], context["user_id"], context["question"], message_id=context["message_id"]
+        )
 
 
 if __name__ == "__main__":
@@ -197,4 +288,8 @@ if __name__ == "__main__":
     if not token:
         logger.error("No Discord bot token found in environment variables!")
         exit(1)
-    client.run(token)
+    try:
+        client.run(token)
+    finally:
+        # Write any contexts the background flusher has not persisted yet
+        question_context.close()
@@ -0,0 +1,92 @@
+# metrics.py
+import asyncio
+import bisect
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the latency buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+
+# Event-loop lag is normally far below a millisecond; anything near 100ms stalls every shard
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count, sum and max."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket containing the q-th quantile."""
+        count = self.count
+        if not count:
+            return 0.0
+        target = q * count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets + (self.max,), self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> str:
+        count = self.count
+        if not count:
+            return "n=0"
+        return (
+            f"n={count} mean={self.total / count:.2f}s p50<={self.quantile(0.5):.2f}s "
+            f"p95<={self.quantile(0.95):.2f}s max={self.max:.2f}s"
+        )
+
+    def __str__(self):
+        labels = [f"<={b:g}s" for b in self.buckets] + [f">{self.buckets[-1]:g}s"]
+        bars = ", ".join(f"{label}: {c}" for label, c in zip(labels, self.counts) if c)
+        return f"{self.summary()} [{bars}]"
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag: how late a short sleep wakes up.
+
+    All shards run by a process share its event loop, so a blocking handler
+    in one shard delays gateway heartbeats and events for all of them.
+    """
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.histogram = LatencyHistogram(LOOP_LAG_BUCKETS)
+
+    async def run_forever(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.histogram.observe(max(0.0, time.perf_counter() - start - self.interval))
+
+    def summary(self) -> str:
+        h = self.histogram
+        if not h.count:
+            return "n=0"
+        return (
+            f"n={h.count} p50<={h.quantile(0.5) * 1000:.1f}ms "
+            f"p99<={h.quantile(0.99) * 1000:.1f}ms max={h.max * 1000:.1f}ms"
+        )
@@ -0,0 +1,175 @@
+# question_pool.py
+import asyncio
+import logging
+import re
+import sqlite3
+import threading
+from collections import deque
+
+logger = logging.getLogger("DiscordBot.QuestionPool")
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# take() pops a question with DELETE ... RETURNING
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pool_questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pool_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question TEXT NOT NULL
+);
+"""
+
+
+def fingerprint(question: str) -> frozenset:
+    """Word set used to compare questions, ignoring case and punctuation."""
+    return frozenset(WORD_RE.findall(question.lower()))
+
+
+def similarity(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of two fingerprints."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class QuestionPool:
+    """Pre-generated trivia questions, kept topped up by a background task.
+
+    Questions that are too similar to any recently generated question are
+    discarded, so members keep getting different questions. The pool and the
+    recent-question history live in SQLite, so every shard process sharing
+    the database file takes from, tops up and dedupes against one pool.
+    Database calls run off the event loop. Requires SQLite 3.35 or newer.
+    """
+
+    def __init__(
+        self,
+        path="question_context.db",
+        target_size=10,
+        similarity_threshold=0.6,
+        history_size=500,
+    ):
+        self.path = path
+        self.target_size = target_size
+        self.similarity_threshold = similarity_threshold
+        self.history_size = history_size
+        if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            raise RuntimeError(
+                f"QuestionPool needs SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} or newer, "
+                f"found {sqlite3.sqlite_version}"
+            )
+        # Fingerprints of the shared history, synced up to _history_id before each add
+        self._history_fingerprints = deque(maxlen=history_size)
+        self._history_id = 0
+        self._wakeup = asyncio.Event()
+        self._lock = threading.Lock()
+        # Autocommit, so BEGIN IMMEDIATE below controls the transactions
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        with self._lock:
+            self._sync_history()
+        logger.info(f"Question pool in {self.path} holds {len(self)} questions")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pool_questions").fetchone()[0]
+
+    def _sync_history(self):
+        """Pull history rows added by any process since the last sync."""
+        rows = self._conn.execute(
+            "SELECT id, question FROM pool_history WHERE id > ? ORDER BY id DESC LIMIT ?",
+            (self._history_id, self.history_size),
+        ).fetchall()
+        for history_id, question in reversed(rows):
+            self._history_fingerprints.append(fingerprint(question))
+            self._history_id = history_id
+
+    def is_duplicate(self, question) -> bool:
+        candidate = fingerprint(question)
+        return any(
+            similarity(candidate, seen) >= self.similarity_threshold
+            for seen in self._history_fingerprints
+        )
+
+    def add(self, question) -> bool:
+        """Add a question unless it is too similar to a recent one from any process."""
+        question = question.strip()
+        if not question:
+            return False
+        with self._lock:
+            # The write lock makes check-then-insert atomic across processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync_history()
+                if self.is_duplicate(question):
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._conn.execute("INSERT INTO pool_history (question) VALUES (?)", (question,))
+                self._conn.execute("INSERT INTO pool_questions (question) VALUES (?)", (question,))
+                self._conn.execute(
+                    "DELETE FROM pool_history WHERE id <= (SELECT MAX(id) FROM pool_history) - ?",
+                    (self.history_size,),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._sync_history()
+        return True
+
+    def _pop(self):
+        with self._lock:
+            row = self._conn.execute(
+                "DELETE FROM pool_questions WHERE id = (SELECT MIN(id) FROM pool_questions) "
+                "RETURNING question"
+            ).fetchone()
+        return row[0] if row else None
+
+    async def take(self):
+        """Pop the oldest question (None if the pool is empty) and wake the refiller."""
+        question = await asyncio.to_thread(self._pop)
+        self._wakeup.set()
+        return question
+
+    async def refill_forever(self, generate, retry_delay=30.0, max_duplicates=5, poll_interval=60.0):
+        """Keep the pool at target_size using generate(), an async question factory.
+
+        generate() should raise on failure; errors and runs of duplicate
+        questions back off for retry_delay seconds. Every process may run a
+        refiller on the shared pool; takes by other processes are noticed
+        within poll_interval seconds.
+        """
+        while True:
+            self._wakeup.clear()
+            duplicates = 0
+            size = await asyncio.to_thread(len, self)
+            while size < self.target_size:
+                try:
+                    question = await generate()
+                except Exception as e:
+                    logger.error(f"Error refilling question pool: {str(e)}")
+                    break
+                if await asyncio.to_thread(self.add, question):
+                    duplicates = 0
+                    size = await asyncio.to_thread(len, self)
+                    logger.debug(f"Pooled question ({size}/{self.target_size}): {question}")
+                else:
+                    duplicates += 1
+                    logger.debug(f"Discarded similar question: {question}")
+                    if duplicates >= max_duplicates:
+                        break
+
+            if size < self.target_size:
+                await asyncio.sleep(retry_delay)
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,76 @@
+# shard_launcher.py
+import argparse
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ShardLauncher")
+
+BOT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+def split_shards(shard_count, processes):
+    """Contiguous blocks of shard ids, one per process."""
+    return [
+        list(range(i * shard_count // processes, (i + 1) * shard_count // processes))
+        for i in range(processes)
+    ]
+
+
+def process_env(shard_ids, shard_count):
+    env = dict(os.environ)
+    env["DISCORD_SHARD_COUNT"] = str(shard_count)
+    env["DISCORD_SHARD_IDS"] = ",".join(map(str, shard_ids))
+    # The question pool and context store are SQLite files shared by every process
+    return env
+
+
+def launch(shard_count, processes, restart_delay):
+    groups = [ids for ids in split_shards(shard_count, processes) if ids]
+    children = {}
+
+    def start(index):
+        shard_ids = groups[index]
+        logger.info(f"Starting process {index} for shards {shard_ids} of {shard_count}")
+        children[index] = subprocess.Popen(
+            [sys.executable, BOT_SCRIPT], env=process_env(shard_ids, shard_count)
+        )
+
+    def stop(signum, frame):
+        logger.info("Stopping shard processes...")
+        for child in children.values():
+            child.terminate()
+        for child in children.values():
+            child.wait()
+        sys.exit(0)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for index in range(len(groups)):
+        start(index)
+
+    while True:
+        time.sleep(1)
+        for index, child in list(children.items()):
+            code = child.poll()
+            if code is None:
+                continue
+            logger.error(f"Process {index} (shards {groups[index]}) exited with code {code}")
+            time.sleep(restart_delay)
+            start(index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the bot as several processes, each with a block of shards")
+    parser.add_argument("--shards", type=int, required=True, help="Total shard count")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--restart-delay", type=float, default=5.0, help="Seconds before restarting a crashed process")
+    args = parser.parse_args()
+
+    launch(args.shards, args.processes, args.restart_delay)
@@ -0,0 +1,184 @@
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from aiohttp import web
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("LoadTest")
+
+
+class FakeOpenAI:
+    """Local stand-in for the OpenAI chat completions endpoint."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+
+    async def chat_completions(self, request):
+        await request.json()
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return web.json_response(
+            {
+                "id": f"chatcmpl-{self.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {
+                            "role": "assistant",
+                            "content": f"Trivia question #{self.requests}?",
+                        },
+                    }
+                ],
+            }
+        )
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        return runner, f"http://127.0.0.1:{port}/v1"
+
+
+class FakeMessage:
+    def __init__(self, message_id):
+        self.id = message_id
+
+
+class FakeChannel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.name = "general-chat"
+        self.sent = 0
+
+    async def send(self, content):
+        self.sent += 1
+        return FakeMessage(self.id * 1000 + self.sent)
+
+
+class FakeAuthor:
+    def __init__(self, author_id, bot=False):
+        self.id = author_id
+        self.bot = bot
+        self.mention = f"<@{author_id}>"
+
+
+class FakeChatMessage:
+    def __init__(self, author, channel, content):
+        self.author = author
+        self.channel = channel
+        self.content = content
+        self.reference = None
+
+
+class FakeGuild:
+    def __init__(self, guild_id):
+        self.id = guild_id
+        self.name = f"guild-{guild_id}"
+        self.channels = [FakeChannel(guild_id * 10)]
+
+
+class FakeMember:
+    def __init__(self, member_id, guild):
+        self.id = member_id
+        self.name = f"member-{member_id}"
+        self.mention = f"<@{member_id}>"
+        self.guild = guild
+
+
+async def measure_loop_lag(stop, interval=0.01):
+    """Worst delay between when a sleep should end and when it actually does."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+def chatter_messages(members, per_member):
+    """Busy-channel traffic: chatter from bystanders, then one answer per member."""
+    bystander = FakeAuthor(1)
+    messages = []
+    for member in members:
+        channel = member.guild.channels[0]
+        for i in range(per_member):
+            messages.append(FakeChatMessage(bystander, channel, f"unrelated chat #{i}"))
+        messages.append(FakeChatMessage(FakeAuthor(member.id), channel, "lol"))
+        messages.append(FakeChatMessage(FakeAuthor(member.id), channel, "I think it's backpropagation"))
+    return messages
+
+
+async def main(joins, guilds, latency, chatter):
+    fake_openai = FakeOpenAI(latency)
+    runner, base_url = await fake_openai.start()
+
+    # Point the bot at the stand-in before it creates its OpenAI client
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-load-test")
+    os.environ.setdefault("QUESTION_CONTEXT_PATH", ":memory:")
+    import main as bot
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    guild_list = [FakeGuild(g + 1) for g in range(guilds)]
+    members = [FakeMember(1000 + i, guild_list[i % guilds]) for i in range(joins)]
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bot.on_member_join(member) for member in members))
+    elapsed = time.perf_counter() - start
+    sent = sum(channel.sent for guild in guild_list for channel in guild.channels)
+    pending = len(bot.question_context)
+
+    requests_before = fake_openai.requests
+    messages = chatter_messages(members, chatter)
+    await asyncio.gather(*(bot.on_message(message) for message in messages))
+    verify_requests = fake_openai.requests - requests_before
+
+    stop.set()
+    worst_lag = await lag_task
+    await runner.cleanup()
+
+    print(f"Burst of {joins} joins across {guilds} guilds, stand-in latency {latency}s")
+    print(f"  Welcome messages sent:   {sent}")
+    print(f"  Pending contexts:        {pending}")
+    print(f"  Wall time:               {elapsed:.2f}s (serial would be ~{joins * latency:.1f}s)")
+    print(f"  Max concurrent requests: {fake_openai.max_in_flight} (limit {bot.OPENAI_MAX_CONCURRENCY})")
+    print(f"  Worst event-loop lag:    {worst_lag * 1000:.1f} ms")
+    print(f"  Question latency:        {bot.openai_latency['question']}")
+    print(f"Then {len(messages)} channel messages ({chatter} bystander messages per member)")
+    print(f"  Verification requests:   {verify_requests}")
+    print(f"  Answer filter:           {bot.answer_filter.summary()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a burst of member joins")
+    parser.add_argument("--joins", type=int, default=50)
+    parser.add_argument("--guilds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.5, help="Stand-in OpenAI latency (s)")
+    parser.add_argument("--chatter", type=int, default=10, help="Bystander messages per member")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.joins, args.guilds, args.latency, args.chatter))
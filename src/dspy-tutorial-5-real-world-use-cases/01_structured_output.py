@@ -5,13 +5,19 @@ Turn messy support emails into structured JSON tickets.
 
 Run:
     python 01_structured_output.py
+    python 01_structured_output.py --input emails.jsonl --output tickets.jsonl
 """
 
+import argparse
+import sys
 from typing import Literal
 
 import dspy
 from dotenv import load_dotenv
 
+from batch_runner import BatchStats, iter_jsonl, iter_mbox, open_sink, run_batch
+from rule_classifier import CascadeExtractor
+
 # Load OPENAI_API_KEY
 load_dotenv(override=True)
 
@@ -64,7 +70,86 @@ sample_emails = [
 ]
 
 
+# ---- Batch mode ------------------------------------------------------------
+PRIORITIES = ("low", "medium", "high")
+TICKET_FIELDS = {
+    "id": "string",
+    "subject": "string",
+    "priority": "string",
+    "product": "string",
+    "negative_sentiment": "bool",
+    "source": "string",
+}
+
+
+def to_ticket(pred: dspy.Prediction) -> dict:
+    """Validated ticket row; raises ValueError if the LM output is malformed."""
+    if pred.priority not in PRIORITIES:
+        raise ValueError(f"invalid priority {pred.priority!r}")
+    if not isinstance(pred.negative_sentiment, bool):
+        raise ValueError(f"invalid negative_sentiment {pred.negative_sentiment!r}")
+    return {
+        "subject": str(pred.subject),
+        "priority": pred.priority,
+        "product": str(pred.product),
+        "negative_sentiment": pred.negative_sentiment,
+    }
+
+
+def lm_ticket(email: str) -> dict:
+    # Validated inside the retried call, so a malformed ticket counts as a failed attempt
+    return to_ticket(extract_ticket(email=email.strip()))
+
+
+def extract_batch(
+    input_path: str,
+    output_path: str,
+    num_threads: int,
+    max_retries: int,
+    rule_threshold: float | None = 0.8,
+) -> None:
+    records = iter_jsonl(input_path) if input_path.endswith(".jsonl") else iter_mbox(input_path)
+    sink = open_sink(output_path, TICKET_FIELDS)
+    stats = BatchStats()
+    # Obvious emails are classified by rules; only low-confidence ones reach the LM
+    cascade = CascadeExtractor(lm_ticket, threshold=rule_threshold) if rule_threshold is not None else None
+    extract = cascade or lm_ticket
+
+    try:
+        for result in run_batch(
+            records,
+            extract,
+            num_threads=num_threads,
+            max_retries=max_retries,
+            skip=sink.completed_ids(),
+            stats=stats,
+        ):
+            if result.error is not None:
+                # Not written, so the next run retries it
+                print(f"Failed {result.id} after {result.attempts} attempts: {result.error}", file=sys.stderr)
+                continue
+            sink.write({"id": result.id, **result.value})
+    finally:
+        sink.close()
+        print(stats.summary())
+        if cascade is not None:
+            print(cascade.summary())
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract structured tickets from support emails")
+    parser.add_argument("--input", help="emails as .jsonl (one {'id', 'email'} per line) or an mbox file")
+    parser.add_argument("--output", default="tickets.jsonl", help=".jsonl file or .parquet directory")
+    parser.add_argument("--threads", type=int, default=8, help="max in-flight LM calls")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--rule-threshold", type=float, default=0.8, help="min rule confidence to skip the LM")
+    parser.add_argument("--no-rules", action="store_true", help="send every email to the LM")
+    args = parser.parse_args()
+    if args.input:
+        threshold = None if args.no_rules else args.rule_threshold
+        extract_batch(args.input, args.output, args.threads, args.retries, threshold)
+        return
+
     for raw in sample_emails:
         pred = extract_ticket(email=raw.strip())
         print("\n--- Structured Ticket ---")
@@ -2,13 +2,22 @@
 Chain‑of‑Thought Reasoning
 
 A financial‑risk checker that explains *why* it approved or rejected an application.
+
+Run:
+    python 02_chain_of_thought.py
+    python 02_chain_of_thought.py --input applicants.csv --output decisions.parquet
 """
 
+import argparse
+import hashlib
+import sys
 from typing import Literal
 
 import dspy
 from dotenv import load_dotenv
 
+from batch_runner import BatchStats, OnceCache, iter_csv, open_sink, run_batch
+
 load_dotenv(override=True)
 
 lm = dspy.LM("openai/gpt-5-mini", temperature=1, max_tokens=20000)
@@ -35,8 +44,99 @@ Loan purpose: consolidate credit cards
 """
 
 
+# ---- Batch scoring ---------------------------------------------------------
+def format_profile(row: dict, id_column: str | None = None) -> str:
+    """CSV row -> profile text in the same "Field: value" layout as sample_profile."""
+    lines = []
+    for column, value in row.items():
+        if column == id_column or value is None or not str(value).strip():
+            continue
+        label = column.replace("_", " ").strip().capitalize()
+        lines.append(f"{label}: {str(value).strip()}")
+    return "\n".join(lines) + "\n"
+
+
+RISK_LEVELS = ("low", "medium", "high")
+BOOLEAN_WORDS = {"true": True, "yes": True, "false": False, "no": False}
+
+
+def to_decision(pred: dspy.Prediction) -> dict:
+    """Validated decision row; raises ValueError if the LM output is malformed."""
+    if pred.loan_risk not in RISK_LEVELS:
+        raise ValueError(f"invalid loan_risk {pred.loan_risk!r}")
+    approved = pred.approved
+    if isinstance(approved, str):
+        # bool("False") is True, so parse the word rather than casting
+        approved = BOOLEAN_WORDS.get(approved.strip().lower(), approved)
+    if not isinstance(approved, bool):
+        raise ValueError(f"invalid approved {pred.approved!r}")
+    return {"loan_risk": pred.loan_risk, "approved": approved, "reasoning": str(pred.reasoning)}
+
+
+def score_profile(profile: str) -> dict:
+    return to_decision(risk_checker(applicant_profile=profile))
+
+
+OUTPUT_FIELDS = {
+    "id": "string",
+    "loan_risk": "string",
+    "approved": "bool",
+    "reasoning": "string",
+    "applicant_profile": "string",
+    "error": "string",
+    "latency_s": "double",
+}
+ERROR_ROW = {"loan_risk": None, "approved": None, "reasoning": None, "applicant_profile": None}
+
+# Identical profiles (re-submitted applications, duplicated rows) are scored once
+cached_score = OnceCache(score_profile)
+
+
+def score_batch(input_path: str, output_path: str, num_threads: int, id_column: str | None) -> None:
+    sink = open_sink(output_path, OUTPUT_FIELDS)
+    stats = BatchStats()
+
+    def score(row: dict) -> dict:
+        profile = format_profile(row, id_column)
+        decision = cached_score(hashlib.sha256(profile.encode("utf-8")).hexdigest(), profile)
+        return {**decision, "applicant_profile": profile, "error": None}
+
+    try:
+        for result in run_batch(
+            iter_csv(input_path, id_column),
+            score,
+            num_threads=num_threads,
+            skip=sink.completed_ids(),
+            stats=stats,
+        ):
+            if isinstance(result.error, ValueError):
+                # Still malformed after retries: recorded as an error row rather than a decision
+                print(f"Unparseable decision for {result.id}: {result.error}", file=sys.stderr)
+                sink.write({"id": result.id, **ERROR_ROW, "error": str(result.error), "latency_s": result.latency})
+                continue
+            if result.error is not None:
+                # Not written, so the next run retries it
+                print(f"Failed {result.id}: {result.error}", file=sys.stderr)
+                continue
+            sink.write({"id": result.id, **result.value, "latency_s": result.latency})
+    finally:
+        sink.close()
+        print(stats.summary())
+        print(f"Profile cache: {cached_score.hits} hits, {cached_score.misses} misses")
+
+
 def main():
-    pred = risk_checker(applicant_profile=sample_profile, age=28, is_male="NO")
+    parser = argparse.ArgumentParser(description="Score loan applications with LoanRisk")
+    parser.add_argument("--input", help="CSV of applicant profiles, one applicant per row")
+    parser.add_argument("--output", default="decisions.jsonl", help=".jsonl file or .parquet directory (needs pyarrow)")
+    parser.add_argument("--threads", type=int, default=8, help="max in-flight LM calls")
+    parser.add_argument("--id-column", default="id", help="CSV column identifying an applicant")
+    args = parser.parse_args()
+    if args.input:
+        score_batch(args.input, args.output, args.threads, args.id_column)
+        return
+
+    pred = risk_checker(applicant_profile=sample_profile)
 
     print("\n--- DSPy History ---")
     print(dspy.inspect_history())
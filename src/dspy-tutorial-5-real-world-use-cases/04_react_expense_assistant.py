@@ -6,11 +6,13 @@ An expense assistant that can fetch exchange rates and run a calculator.
 
 import math
 import os
-import re
 
 import dspy
 from dotenv import load_dotenv
 
+from fx_provider import DEFAULT_RATES_PATH, FXProvider
+from safe_calc import evaluate
+
 load_dotenv(override=True)
 
 # lm = dspy.LM("openai/gpt-5-mini", temperature=1, max_tokens=128000)
@@ -19,34 +21,39 @@ lm = dspy.LM(
 )  # , temperature=1, max_tokens=128000)
 dspy.settings.configure(lm=lm)
 
+fx = FXProvider(
+    os.getenv("FX_RATES_SOURCE", DEFAULT_RATES_PATH),
+    ttl=float(os.getenv("FX_RATES_TTL", "3600")),
+).start()
+
 # ---- Tools ---------------------------------------------------------------
 
 
-def get_exchange_rate(currency_code: str) -> float:
-    """Return USD conversion rate."""
-    fx = {"USD": 1.0, "EUR": 1.07, "GBP": 1.26}
-    return fx.get(currency_code.upper(), 0.0)
+def get_exchange_rate(currency_code: str, date: str | None = None) -> float:
+    """Return the USD value of one unit of an ISO-4217 currency, on a YYYY-MM-DD date or latest."""
+    return fx.rate(currency_code, date)
+
+
+def convert_to_usd(amounts: list[float], currencies: list[str], dates: list[str] | None = None) -> list[float]:
+    """Convert many expense lines to USD at once; optional YYYY-MM-DD date per line."""
+    return [round(v, 2) for v in fx.convert(amounts, currencies, dates).tolist()]
 
 
-def calculate(expression: str, yolo: bool = False) -> float:
-    """Eval a safe math expression like '123*0.5'."""
-    if yolo:
-        print(f"WARNING: Potential unsave eval of '{expression}'")
-        return eval(expression)
-    if not re.fullmatch(r"[0-9+\-*/(). ]+", expression):
-        raise ValueError(f"Unable to evaluate expression '{expression}'")
-    return eval(expression)
+def calculate(expression: str) -> float:
+    """Evaluate an arithmetic expression like '123*0.5' or 'round(120*1.07, 2)'."""
+    return evaluate(expression)
 
 
 # ---- End Tools ---------------------------------------------------------------
 
 
 exchange_tool = dspy.Tool(get_exchange_rate, name="FX")
+convert_tool = dspy.Tool(convert_to_usd, name="ConvertToUSD")
 calc_tool = dspy.Tool(calculate, name="Calc")
 
 expense_agent = dspy.ReAct(
     "prompt -> answer",
-    tools=[exchange_tool, calc_tool],
+    tools=[exchange_tool, convert_tool, calc_tool],
 )
 
 
@@ -0,0 +1,236 @@
+"""
+Nearest-neighbour indexes over L2-normalised vectors (inner product = cosine).
+
+Every backend has the same small interface, so the retriever does not care
+which one it is using:
+
+    index.add(vectors)                 # incremental insert, ids continue from len(index)
+    index.search(queries, k)           # -> (scores, ids), both shaped (n_queries, k)
+    index.save(directory) / Backend.load(directory)
+
+``ExactIndex`` is brute force. ``IVFIndex`` is an inverted-file index: a
+k-means coarse quantiser splits the vectors into ``nlist`` lists and a
+query only scans the ``nprobe`` lists whose centroids are closest.
+"""
+
+import json
+import os
+
+import numpy as np
+
+
+class _VectorBuffer:
+    """Growable float32 matrix with amortised O(1) appends."""
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self._data = np.empty((capacity, dim), dtype=np.float32)
+        self.size = 0
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._data[: self.size]
+
+    def extend(self, vectors: np.ndarray) -> None:
+        needed = self.size + len(vectors)
+        if needed > len(self._data):
+            grown = np.empty((max(needed, 2 * len(self._data)), self._data.shape[1]), dtype=np.float32)
+            grown[: self.size] = self._data[: self.size]
+            self._data = grown
+        self._data[self.size : needed] = vectors
+        self.size = needed
+
+
+def _top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Indices and values of the k largest scores per row, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.empty((len(scores), 0))
+        return empty.astype(np.int64), empty.astype(np.float32)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1)
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+def _as_queries(queries) -> np.ndarray:
+    return np.atleast_2d(np.asarray(queries, dtype=np.float32))
+
+
+class ExactIndex:
+    """Brute-force inner-product search; the recall baseline."""
+
+    kind = "exact"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._vectors = _VectorBuffer(dim)
+
+    def __len__(self) -> int:
+        return self._vectors.size
+
+    def add(self, vectors: np.ndarray) -> None:
+        self._vectors.extend(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+
+    def search(self, queries, k: int) -> tuple[np.ndarray, np.ndarray]:
+        ids, scores = _top_k(_as_queries(queries) @ self._vectors.array.T, k)
+        return scores, ids
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "vectors.npy"), self._vectors.array)
+        _write_meta(directory, {"kind": self.kind, "dim": self.dim})
+
+    @classmethod
+    def load(cls, directory: str) -> "ExactIndex":
+        meta = _read_meta(directory)
+        index = cls(meta["dim"])
+        index.add(np.load(os.path.join(directory, "vectors.npy")))
+        return index
+
+
+def kmeans(vectors: np.ndarray, n_clusters: int, n_iter: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means; returns L2-normalised centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        counts = np.bincount(assign, minlength=n_clusters)
+        # Sum each cluster's members in one pass over the vectors sorted by cluster
+        order = np.argsort(assign, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        empty = counts == 0
+        sums = np.zeros_like(centroids)
+        sums[~empty] = np.add.reduceat(vectors[order], starts[~empty])
+        # Re-seed empty clusters from random points instead of leaving them dead
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """Inverted-file index with a NumPy k-means coarse quantiser.
+
+    Train once on a sample with ``train`` (``add`` trains automatically on
+    the first batch if needed). Later inserts are assigned to the existing
+    lists; call ``train`` again after the data has grown a lot.
+    """
+
+    kind = "ivf"
+
+    def __init__(self, dim: int, nlist: int | None = None, nprobe: int = 16, train_sample: int = 64):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_sample = train_sample  # training points per list
+        self.centroids: np.ndarray | None = None
+        self._vectors = _VectorBuffer(dim)
+        self._assign = np.empty(0, dtype=np.int32)
+        self._order = None  # ids grouped by list, rebuilt lazily after inserts
+        self._offsets = None
+
+    def __len__(self) -> int:
+        return self._vectors.size
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, vectors: np.ndarray, seed: int = 0) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        nlist = self.nlist or max(1, int(4 * np.sqrt(len(vectors))))
+        nlist = min(nlist, len(vectors))
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(vectors), nlist * self.train_sample)
+        sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+        self.centroids = kmeans(sample, nlist, seed=seed)
+        self.nlist = nlist
+        if len(self):
+            self._assign = self._assign_lists(self._vectors.array)
+            self._order = None
+
+    def _assign_lists(self, vectors: np.ndarray, batch_size: int = 8192) -> np.ndarray:
+        return np.concatenate(
+            [
+                np.argmax(vectors[i : i + batch_size] @ self.centroids.T, axis=1).astype(np.int32)
+                for i in range(0, len(vectors), batch_size)
+            ]
+            or [np.empty(0, dtype=np.int32)]
+        )
+
+    def add(self, vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if not self.is_trained:
+            self.train(vectors)
+        self._vectors.extend(vectors)
+        self._assign = np.concatenate([self._assign, self._assign_lists(vectors)])
+        self._order = None
+
+    def _lists(self):
+        if self._order is None:
+            self._order = np.argsort(self._assign, kind="stable")
+            counts = np.bincount(self._assign, minlength=self.nlist)
+            self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        return self._order, self._offsets
+
+    def search(self, queries, k: int) -> tuple[np.ndarray, np.ndarray]:
+        queries = _as_queries(queries)
+        scores_out = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids_out = np.full((len(queries), k), -1, dtype=np.int64)
+        if not len(self):
+            return scores_out, ids_out
+
+        order, offsets = self._lists()
+        nprobe = min(self.nprobe, self.nlist)
+        probe, _ = _top_k(queries @ self.centroids.T, nprobe)
+        vectors = self._vectors.array
+        for qi, (query, lists) in enumerate(zip(queries, probe)):
+            candidates = np.concatenate([order[offsets[c] : offsets[c + 1]] for c in lists])
+            if not len(candidates):
+                continue
+            top, top_scores = _top_k((vectors[candidates] @ query)[None, :], k)
+            n = top.shape[1]
+            ids_out[qi, :n] = candidates[top[0]]
+            scores_out[qi, :n] = top_scores[0]
+        return scores_out, ids_out
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "vectors.npy"), self._vectors.array)
+        np.save(os.path.join(directory, "assign.npy"), self._assign)
+        if self.is_trained:
+            np.save(os.path.join(directory, "centroids.npy"), self.centroids)
+        _write_meta(
+            directory,
+            {"kind": self.kind, "dim": self.dim, "nlist": self.nlist, "nprobe": self.nprobe},
+        )
+
+    @classmethod
+    def load(cls, directory: str) -> "IVFIndex":
+        meta = _read_meta(directory)
+        index = cls(meta["dim"], nlist=meta["nlist"], nprobe=meta["nprobe"])
+        centroids_path = os.path.join(directory, "centroids.npy")
+        if os.path.exists(centroids_path):
+            index.centroids = np.load(centroids_path)
+        index._vectors.extend(np.load(os.path.join(directory, "vectors.npy")))
+        index._assign = np.load(os.path.join(directory, "assign.npy"))
+        return index
+
+
+BACKENDS = {cls.kind: cls for cls in (ExactIndex, IVFIndex)}
+
+
+def _write_meta(directory: str, meta: dict) -> None:
+    tmp_path = os.path.join(directory, "index.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(directory, "index.json"))
+
+
+def _read_meta(directory: str) -> dict:
+    with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_index(directory: str):
+    """Load a saved index of any backend."""
+    return BACKENDS[_read_meta(directory)["kind"]].load(directory)
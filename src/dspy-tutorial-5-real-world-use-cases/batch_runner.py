@@ -0,0 +1,301 @@
+"""
+Bounded-concurrency batch runner with retries, streaming sinks and resume.
+
+Records stream from a reader (JSONL, mbox, CSV), run through a function on a
+thread pool with at most ``num_threads`` calls in flight, and are written to
+a sink as they finish. Sinks know which record ids they already hold, so an
+interrupted run restarted with the same output skips finished records.
+"""
+
+import csv
+import hashlib
+import json
+import mailbox
+import os
+import random
+import statistics
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from email.message import Message
+from typing import Any
+
+
+def record_id(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+# ---- Readers --------------------------------------------------------------
+
+
+def iter_jsonl(path: str, text_field: str = "email") -> Iterator[tuple[str, str]]:
+    """(id, text) per line; ids default to a hash of the text."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            text = row[text_field]
+            yield str(row.get("id") or record_id(text)), text
+
+
+def _message_text(message: Message) -> str:
+    parts = message.walk() if message.is_multipart() else [message]
+    body = []
+    for part in parts:
+        if part.get_content_type() == "text/plain":
+            payload = part.get_payload(decode=True) or b""
+            body.append(payload.decode(part.get_content_charset() or "utf-8", errors="replace"))
+    return f"Subject: {message.get('Subject', '')}\n\n" + "\n".join(body).strip()
+
+
+def iter_mbox(path: str) -> Iterator[tuple[str, str]]:
+    """(Message-ID, "Subject: ...\\n\\nbody") per message."""
+    for message in mailbox.mbox(path):
+        text = _message_text(message)
+        yield str(message.get("Message-ID") or record_id(text)).strip(), text
+
+
+def iter_csv(path: str, id_field: str | None = None) -> Iterator[tuple[str, dict]]:
+    """(id, row) per CSV row; ids default to a hash of the row."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            key = row.get(id_field) if id_field else None
+            yield str(key or record_id(json.dumps(row, sort_keys=True))), row
+
+
+# ---- Sinks -----------------------------------------------------------------
+
+
+class JsonlSink:
+    """Appends one JSON object per record, flushed line by line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._drop_partial_line()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _drop_partial_line(self) -> None:
+        """Cut a last line left unterminated by an interrupted run."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def completed_ids(self) -> set[str]:
+        done = set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                done.add(json.loads(line)["id"])
+        return done
+
+    def write(self, row: dict) -> None:
+        self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink:
+    """Writes records to ``directory/part-NNNNN.parquet`` every ``rows_per_file`` rows
+    or ``flush_seconds``, whichever comes first.
+
+    Buffered rows are lost if the process is killed, so both budgets are kept
+    small; the cost is more, smaller part files.
+
+    Every part shares one schema so the directory reads back as a single
+    table: ``fields`` maps column names to pyarrow type aliases ("string",
+    "bool", "double", ...). Without it the schema of the first part is reused.
+    Missing keys are written as null; keys outside the schema are dropped.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        rows_per_file: int = 100,
+        flush_seconds: float = 30.0,
+        fields: dict[str, str] | None = None,
+    ):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from e
+        self.directory = directory
+        self.rows_per_file = rows_per_file
+        self.flush_seconds = flush_seconds
+        self._rows: list[dict] = []
+        self._flushed_at = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        if fields:
+            self.schema = pa.schema([(name, pa.type_for_alias(alias)) for name, alias in fields.items()])
+        else:
+            parts = self._parts()
+            self.schema = pq.read_schema(parts[0]) if parts else None
+
+    def _parts(self) -> list[str]:
+        return sorted(
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.startswith("part-") and name.endswith(".parquet")
+        )
+
+    def completed_ids(self) -> set[str]:
+        import pyarrow.parquet as pq
+
+        return {i for part in self._parts() for i in pq.read_table(part, columns=["id"]).column("id").to_pylist()}
+
+    def write(self, row: dict) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self.rows_per_file or time.monotonic() - self._flushed_at >= self.flush_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        self._flushed_at = time.monotonic()
+        if not self._rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = os.path.join(self.directory, f"part-{len(self._parts()):05d}.parquet")
+        tmp_path = f"{path}.tmp"
+        table = pa.Table.from_pylist(self._rows, schema=self.schema)
+        self.schema = table.schema
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+        self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+
+
+def open_sink(path: str, fields: dict[str, str] | None = None):
+    """Parquet sink for ``*.parquet`` paths (a directory of parts), JSONL otherwise.
+
+    ``fields`` fixes the Parquet schema (see ParquetSink); JSONL ignores it.
+    """
+    return ParquetSink(path, fields=fields) if path.endswith(".parquet") else JsonlSink(path)
+
+
+# ---- Runner ----------------------------------------------------------------
+
+
+class OnceCache:
+    """Thread-safe memo that runs ``fn`` once per key, even for concurrent requests.
+
+    A second thread asking for a key that is still being computed waits for
+    the first result instead of calling ``fn`` again. Failures are not cached.
+    """
+
+    def __init__(self, fn: Callable):
+        self.fn = fn
+        self.hits = 0
+        self.misses = 0
+        self._futures: dict[Any, Future] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, key, *args, **kwargs):
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if owner:
+            try:
+                future.set_result(self.fn(*args, **kwargs))
+            except Exception as e:
+                with self._lock:
+                    del self._futures[key]
+                future.set_exception(e)
+        return future.result()
+
+
+@dataclass
+class BatchResult:
+    id: str
+    value: Any = None
+    error: Exception | None = None
+    attempts: int = 1
+    latency: float = 0.0
+
+
+class BatchStats:
+    """Throughput and per-record latency of a batch run."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.latencies: list[float] = []
+        self.errors = 0
+        self.skipped = 0
+
+    def record(self, result: BatchResult) -> None:
+        self.latencies.append(result.latency)
+        if result.error is not None:
+            self.errors += 1
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.start
+        n = len(self.latencies)
+        if not n:
+            return f"0 records in {elapsed:.1f}s ({self.skipped} already done)"
+        cuts = statistics.quantiles(self.latencies, n=20, method="inclusive") if n > 1 else self.latencies * 19
+        return (
+            f"{n} records in {elapsed:.1f}s ({n / elapsed:.1f}/s), {self.errors} failed, "
+            f"{self.skipped} already done; latency p50 {cuts[9]:.2f}s p95 {cuts[18]:.2f}s max {max(self.latencies):.2f}s"
+        )
+
+
+def _call_with_retry(fn: Callable, key: str, payload, max_retries: int, backoff: float) -> BatchResult:
+    start = time.perf_counter()
+    for attempt in range(1, max_retries + 2):
+        try:
+            return BatchResult(key, fn(payload), attempts=attempt, latency=time.perf_counter() - start)
+        except Exception as e:
+            if attempt > max_retries:
+                return BatchResult(key, error=e, attempts=attempt, latency=time.perf_counter() - start)
+            # Exponential backoff with jitter so retries from many threads do not line up
+            time.sleep(backoff * 2 ** (attempt - 1) * (0.5 + random.random()))
+
+
+def run_batch(
+    records: Iterable[tuple[str, Any]],
+    fn: Callable,
+    num_threads: int = 8,
+    max_retries: int = 3,
+    backoff: float = 1.0,
+    skip: set[str] = frozenset(),
+    stats: BatchStats | None = None,
+) -> Iterator[BatchResult]:
+    """Apply ``fn`` to each record's payload, yielding results as they finish.
+
+    Only ``2 * num_threads`` records are read ahead of the workers, so the
+    input can be far larger than memory. Records whose id is in ``skip``, or
+    repeats an id already dispatched in this run, are not run.
+    """
+    stats = stats or BatchStats()
+    window = 2 * num_threads
+    seen = set(skip)
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        pending = set()
+        for key, payload in records:
+            if key in seen:
+                stats.skipped += 1
+                continue
+            seen.add(key)
+            pending.add(pool.submit(_call_with_retry, fn, key, payload, max_retries, backoff))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats.record(future.result())
+                    yield future.result()
+        for future in as_completed(pending):
+            stats.record(future.result())
+            yield future.result()
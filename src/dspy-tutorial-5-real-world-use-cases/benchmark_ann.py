@@ -0,0 +1,93 @@
+"""
+Recall / latency benchmark: IVF index vs. exact search.
+
+Uses synthetic clustered unit vectors shaped like MiniLM embeddings (384-d),
+so it runs without downloading a model.
+
+Run:
+    python benchmark_ann.py --n 500000 --queries 200
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from ann_index import ExactIndex, IVFIndex, load_index
+
+
+def synthetic_vectors(n: int, dim: int, n_topics: int, rng: np.random.Generator) -> np.ndarray:
+    """Unit vectors scattered around random topic directions, like real passages."""
+    topics = rng.standard_normal((n_topics, dim)).astype(np.float32)
+    vectors = topics[rng.integers(n_topics, size=n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(np.intersect1d(f, t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def timed_search(index, queries: np.ndarray, k: int) -> tuple[np.ndarray, float]:
+    """Ids found and mean latency (ms) for one query at a time, as the RAG bot issues them."""
+    ids = []
+    start = time.perf_counter()
+    for q in queries:
+        ids.append(index.search(q, k)[1][0])
+    return np.array(ids), (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the IVF index against exact search")
+    parser.add_argument("--n", type=int, default=200_000, help="number of passages")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = synthetic_vectors(args.n, args.dim, n_topics=max(10, args.n // 500), rng=rng)
+    queries = synthetic_vectors(args.queries, args.dim, n_topics=max(10, args.n // 500), rng=rng)
+    print(f"{args.n:,} passages x {args.dim}-d, {args.queries} queries, k={args.k}")
+
+    exact = ExactIndex(args.dim)
+    exact.add(vectors)
+    truth, exact_ms = timed_search(exact, queries, args.k)
+    print(f"exact            recall 1.000  {exact_ms:8.2f} ms/query")
+
+    # Build on 90% of the data, then insert the rest incrementally
+    split = int(0.9 * args.n)
+    ivf = IVFIndex(args.dim)
+    start = time.perf_counter()
+    ivf.add(vectors[:split])
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    ivf.add(vectors[split:])
+    insert_s = time.perf_counter() - start
+    print(f"ivf build        nlist={ivf.nlist}  {build_s:.1f}s train+add, {insert_s:.2f}s to insert {args.n - split:,} more")
+
+    for nprobe in args.nprobe:
+        ivf.nprobe = nprobe
+        found, ivf_ms = timed_search(ivf, queries, args.k)
+        print(
+            f"ivf nprobe={nprobe:<4}  recall {recall_at_k(found, truth):.3f}  {ivf_ms:8.2f} ms/query"
+            f"  ({exact_ms / ivf_ms:.1f}x faster)"
+        )
+
+    directory = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        ivf.save(directory)
+        loaded = load_index(directory)
+        reload_s = time.perf_counter() - start
+        same = np.array_equal(timed_search(loaded, queries[:10], args.k)[0], timed_search(ivf, queries[:10], args.k)[0])
+        print(f"save + load      {reload_s:.2f}s, identical results: {same}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Microbenchmark: safe_calc vs. eval for the expense agent's Calc tool.
+
+Compares a regex check plus ``eval`` (the old ``calculate``), the compiled and
+cached AST evaluator, and one batch call over a month of expense lines.
+
+Run:
+    python benchmark_calc.py --calls 100000 --lines 5000
+"""
+
+import argparse
+import re
+import time
+
+import numpy as np
+
+from safe_calc import compile_expression, evaluate, evaluate_batch
+
+EXPRESSIONS = ["120*1.07", "(45.5 + 12.25) * 1.26", "75 - 120*1.07", "3*24.99/1.07", "(1200/12) * 0.85"]
+SAFE_CHARS = re.compile(r"[0-9+\-*/(). ]+")
+
+
+def regex_eval(expression: str) -> float:
+    if not SAFE_CHARS.fullmatch(expression):
+        raise ValueError(expression)
+    return eval(expression)
+
+
+def time_per_call(fn, expressions: list[str]) -> float:
+    start = time.perf_counter()
+    for expression in expressions:
+        fn(expression)
+    return (time.perf_counter() - start) / len(expressions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--lines", type=int, default=5_000)
+    args = parser.parse_args()
+
+    expressions = [EXPRESSIONS[i % len(EXPRESSIONS)] for i in range(args.calls)]
+    for expression in EXPRESSIONS:
+        assert abs(evaluate(expression) - eval(expression)) < 1e-9, expression
+
+    print(f"{args.calls} scalar calls over {len(EXPRESSIONS)} distinct expressions:")
+    print(f"  regex + eval        {time_per_call(regex_eval, expressions) * 1e6:7.2f} us/call")
+    compile_expression.cache_clear()
+    print(f"  safe_calc (cached)  {time_per_call(evaluate, expressions) * 1e6:7.2f} us/call")
+    unique = [f"{i} * 1.07 + 3" for i in range(min(args.calls, 10_000))]
+    print(f"  safe_calc (no hits) {time_per_call(evaluate, unique) * 1e6:7.2f} us/call  ({len(unique)} unique)")
+
+    rng = np.random.default_rng(0)
+    amounts = rng.uniform(5, 500, args.lines).round(2)
+    rates = rng.choice([1.0, 1.07, 1.26], args.lines)
+    start = time.perf_counter()
+    loop = [eval(f"{a}*{r}") for a, r in zip(amounts, rates)]
+    loop_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = evaluate_batch("amount * rate", amount=amounts, rate=rates)
+    batch_time = time.perf_counter() - start
+    assert np.allclose(loop, batch)
+
+    print(f"\n{args.lines} expense lines, 'amount * rate':")
+    print(f"  eval per line       {loop_time * 1e3:7.2f} ms")
+    print(f"  evaluate_batch      {batch_time * 1e3:7.2f} ms  ({loop_time / batch_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+On-disk embedding cache for the handbook retrievers.
+
+Passage vectors are stored per model as a raw float32 matrix that is opened
+with ``np.memmap``, plus a small JSON file mapping each row to the SHA-256 of
+its passage. Only new or changed passages are encoded; an unchanged corpus
+is served straight from the memmap without loading the model at all.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+
+import dspy
+import numpy as np
+
+from ann_index import BACKENDS, load_index
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# Next to the scripts, whatever the working directory
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".embedding_cache")
+# Same cut-over point as dspy.retrievers.Embeddings uses for its FAISS index
+ANN_THRESHOLD = 20_000
+
+
+def passage_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """Append-only matrix of L2-normalised passage vectors for one model."""
+
+    def __init__(self, model_name: str, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.model_name = model_name
+        self.directory = os.path.join(cache_dir, model_name.replace("/", "__"))
+        self.meta_path = os.path.join(self.directory, "meta.json")
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.dim: int | None = None
+        self.hashes: list[str] = []
+        # The matrix file is named in meta.json, so prune can swap both in one replace
+        self.vectors_file = "vectors.f32"
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            self.dim = meta["dim"]
+            self.hashes = meta["hashes"]
+            self.vectors_file = meta.get("vectors", self.vectors_file)
+        self.rows = {h: i for i, h in enumerate(self.hashes)}
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    @property
+    def vectors_path(self) -> str:
+        return os.path.join(self.directory, self.vectors_file)
+
+    def matrix(self) -> np.ndarray:
+        """Read-only memmap of every stored vector (no copy)."""
+        if not self.hashes:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(self.hashes), self.dim))
+
+    def _append(self, hashes: list[str], vectors: np.ndarray) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-d vectors for {self.model_name}, got {vectors.shape[1]}")
+
+        # Drop rows left behind by an interrupted append before adding new ones
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(len(self.hashes) * self.dim * 4)
+            f.write(vectors.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        for h in hashes:
+            self.rows[h] = len(self.hashes)
+            self.hashes.append(h)
+        self._write_meta()
+
+    def _write_meta(self) -> None:
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"model": self.model_name, "dim": self.dim, "vectors": self.vectors_file, "hashes": self.hashes}, f
+            )
+        os.replace(tmp_path, self.meta_path)
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Drop every stored vector whose hash is not in ``keep``; returns how many.
+
+        Edited or removed passages leave their old rows behind, so the
+        remaining rows are copied, in order, into a new matrix file that
+        meta.json is then switched to; memmaps already handed out keep
+        reading the old file until they are dropped.
+        """
+        keep = set(keep)
+        kept = [h for h in self.hashes if h in keep]
+        removed = len(self.hashes) - len(kept)
+        if not removed:
+            return 0
+        rows = np.fromiter((self.rows[h] for h in kept), dtype=np.int64, count=len(kept))
+        old_path = self.vectors_path
+        new_file = f"vectors.{hashlib.sha256(''.join(kept).encode()).hexdigest()[:12]}.f32"
+        with open(os.path.join(self.directory, new_file), "wb") as f:
+            f.write(np.ascontiguousarray(self.matrix()[rows]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self.vectors_file = new_file
+        self.hashes = kept
+        self.rows = {h: i for i, h in enumerate(kept)}
+        self._write_meta()
+        os.remove(old_path)
+        return removed
+
+    def embed(self, passages: list[str], encode) -> np.ndarray:
+        """Vectors for ``passages``, encoding only those not stored yet.
+
+        ``encode(texts)`` must return normalised float32 vectors. When the
+        passages are exactly the stored rows in order the memmap itself is
+        returned; otherwise the needed rows are gathered into a new array.
+        """
+        hashes = [passage_hash(p) for p in passages]
+        missing = {}
+        for h, p in zip(hashes, passages):
+            if h not in self.rows and h not in missing:
+                missing[h] = p
+        if missing:
+            self._append(list(missing), encode(list(missing.values())))
+
+        matrix = self.matrix()
+        rows = np.fromiter((self.rows[h] for h in hashes), dtype=np.int64, count=len(hashes))
+        if len(rows) and rows[0] == 0 and np.array_equal(rows, np.arange(len(rows))):
+            return matrix[: len(rows)]
+        return matrix[rows]
+
+
+class CachedEmbedder:
+    """SentenceTransformer embedder whose corpus vectors come from an EmbeddingStore.
+
+    The model is only loaded when something has to be encoded: new passages
+    or the first query.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, cache_dir: str = DEFAULT_CACHE_DIR, batch_size: int = 64):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.store = EmbeddingStore(model_name, cache_dir)
+        self._model = None
+        self._corpus = None
+        self._corpus_embeddings = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+
+            self._model = SentenceTransformer(self.model_name, device="cpu")
+        return self._model
+
+    def encode(self, texts):
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        return vectors.astype(np.float32, copy=False)
+
+    def load_corpus(self, corpus: list[str]) -> np.ndarray:
+        self._corpus = corpus
+        self._corpus_embeddings = self.store.embed(corpus, self.encode)
+        return self._corpus_embeddings
+
+    def __call__(self, texts):
+        # dspy.retrievers.Embeddings embeds the exact corpus list it was given once, at init
+        if texts is self._corpus:
+            return self._corpus_embeddings
+        return self.encode(texts)
+
+
+class IndexedRetriever:
+    """Drop-in for ``dspy.retrievers.Embeddings`` on top of an ``ann_index`` backend.
+
+    Supports incremental inserts with ``add`` and persists the index next to
+    the embedding cache, so a restart only indexes passages added since.
+    """
+
+    def __init__(self, embedder: CachedEmbedder, index, k: int = 3, directory: str | None = None):
+        self.embedder = embedder
+        self.index = index
+        self.k = k
+        self.directory = directory
+        self.passages: list[str] = []
+        self.hashes: list[str] = []
+        self._known = set()
+
+    def __call__(self, query: str) -> dspy.Prediction:
+        return self.forward(query)
+
+    def forward(self, query: str) -> dspy.Prediction:
+        _, ids = self.index.search(self.embedder([query]), self.k)
+        indices = [int(i) for i in ids[0] if i >= 0]
+        return dspy.Prediction(passages=[self.passages[i] for i in indices], indices=indices)
+
+    def _extend(self, passages: list[str], hashes: list[str]) -> None:
+        self.passages.extend(passages)
+        self.hashes.extend(hashes)
+        self._known.update(hashes)
+
+    def add(self, passages: list[str]) -> int:
+        """Index passages not seen before; returns how many were added."""
+        new = {}
+        for p in passages:
+            h = passage_hash(p)
+            if h not in self._known and h not in new:
+                new[h] = p
+        if not new:
+            return 0
+        self.index.add(self.embedder.store.embed(list(new.values()), self.embedder.encode))
+        self._extend(list(new.values()), list(new))
+        return len(new)
+
+    def save(self) -> None:
+        self.index.save(self.directory)
+        with open(os.path.join(self.directory, "passages.json"), "w", encoding="utf-8") as f:
+            json.dump(self.hashes, f)
+
+
+def indexed_retriever(
+    corpus: list[str],
+    k: int = 3,
+    backend: str = "ivf",
+    model_name: str = DEFAULT_MODEL,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    **index_kwargs,
+) -> IndexedRetriever:
+    """Retriever over a persisted ``backend`` index, updated incrementally for ``corpus``.
+
+    The saved index is reused when its passages are a prefix of ``corpus``
+    (new passages are appended); otherwise it is rebuilt.
+    """
+    embedder = CachedEmbedder(model_name, cache_dir)
+    directory = os.path.join(embedder.store.directory, f"index-{backend}")
+    unique = {passage_hash(p): p for p in corpus}
+    hashes = list(unique)
+
+    saved = None
+    passages_path = os.path.join(directory, "passages.json")
+    if os.path.exists(passages_path):
+        with open(passages_path, encoding="utf-8") as f:
+            saved = json.load(f)
+    if saved is not None and saved == hashes[: len(saved)]:
+        index = load_index(directory)
+        retriever = IndexedRetriever(embedder, index, k, directory)
+        retriever._extend([unique[h] for h in saved], saved)
+    else:
+        # One embedding pass both sizes the new index and fills it
+        passages = list(unique.values())
+        vectors = embedder.store.embed(passages, embedder.encode)
+        index = BACKENDS[backend](vectors.shape[1], **index_kwargs)
+        retriever = IndexedRetriever(embedder, index, k, directory)
+        if passages:
+            index.add(vectors)
+            retriever._extend(passages, hashes)
+            retriever.save()
+        return retriever
+
+    if retriever.add(list(unique.values())[len(saved) :]):
+        retriever.save()
+    return retriever
+
+
+def cached_retriever(
+    corpus: list[str],
+    k: int = 3,
+    model_name: str = DEFAULT_MODEL,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    backend: str | None = None,
+):
+    """Retriever over ``corpus`` backed by the on-disk embedding cache.
+
+    By default small corpora use ``dspy.retrievers.Embeddings`` (brute force)
+    and corpora of ``ANN_THRESHOLD`` passages or more a persisted IVF index;
+    pass ``backend="exact"`` or ``"ivf"`` to choose explicitly.
+    """
+    if backend is None and len(corpus) >= ANN_THRESHOLD:
+        backend = "ivf"
+    if backend is not None:
+        return indexed_retriever(corpus, k, backend, model_name, cache_dir)
+
+    embedder = CachedEmbedder(model_name, cache_dir)
+    embedder.load_corpus(corpus)
+    # Vectors are already normalised; normalising again would copy the memmap
+    return dspy.retrievers.Embeddings(corpus=corpus, embedder=embedder, k=k, normalize=False)
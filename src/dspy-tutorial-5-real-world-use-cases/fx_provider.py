@@ -0,0 +1,166 @@
+"""
+Exchange rates for the expense agent, from a local table or rate service.
+
+The source is a CSV with one row per rate date and one column per ISO-4217
+code, holding USD per unit of that currency (see ``fx_rates.csv``). It can
+be a file path or an ``http(s)://`` URL serving the same CSV. Rates are held
+in a dates x currencies NumPy matrix, so a rate lookup is an index and
+``convert`` prices a month of expense lines in one vectorized call.
+``FXProvider`` reloads the source in the background every ``ttl`` seconds.
+"""
+
+import csv
+import io
+import logging
+import os
+import threading
+import time
+import urllib.request
+from collections.abc import Sequence
+from datetime import date
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fx_rates.csv")
+
+
+class UnknownCurrency(KeyError):
+    pass
+
+
+def _read_source(source: str) -> str:
+    if source.startswith(("http://", "https://")):
+        with urllib.request.urlopen(source, timeout=10) as response:
+            return response.read().decode("utf-8")
+    with open(source, encoding="utf-8") as f:
+        return f.read()
+
+
+class RateTable:
+    """Immutable USD-per-unit rates, ``rates[date_index, currency_index]``.
+
+    A currency missing on a date carries its previous rate forward; a date
+    between rows uses the latest row on or before it.
+    """
+
+    def __init__(self, dates: np.ndarray, codes: list[str], rates: np.ndarray):
+        order = np.argsort(dates)
+        self.dates = dates[order]
+        self.codes = codes
+        self.index = {code: i for i, code in enumerate(codes)}
+        rates = rates[order]
+        for row in range(1, len(rates)):
+            missing = np.isnan(rates[row])
+            rates[row, missing] = rates[row - 1, missing]
+        self.rates = rates
+
+    @classmethod
+    def from_csv(cls, text: str) -> "RateTable":
+        lines = (line for line in io.StringIO(text) if line.strip() and not line.startswith("#"))
+        reader = csv.reader(lines)
+        header = next(reader)
+        codes = [code.strip().upper() for code in header[1:]]
+        dates, rows = [], []
+        for row in reader:
+            dates.append(row[0].strip())
+            rows.append([float(v) if v.strip() else np.nan for v in row[1:]])
+        return cls(np.array(dates, dtype="datetime64[D]"), codes, np.array(rows, dtype=np.float64))
+
+    def _date_rows(self, on) -> np.ndarray:
+        """Row index of the latest rate date on or before each of ``on``."""
+        if on is None:
+            return np.array(len(self.dates) - 1)
+        rows = np.searchsorted(self.dates, np.asarray(on, dtype="datetime64[D]"), side="right") - 1
+        if np.any(rows < 0):
+            raise ValueError(f"No rates before {self.dates[0]}")
+        return rows
+
+    def _columns(self, currencies: Sequence[str]) -> np.ndarray:
+        # Map each distinct code once; expense lines repeat a handful of currencies
+        unique, inverse = np.unique(np.char.upper(np.asarray(currencies, dtype=str)), return_inverse=True)
+        try:
+            columns = np.array([self.index[code] for code in unique], dtype=np.intp)
+        except KeyError as e:
+            raise UnknownCurrency(f"No rate for currency {e.args[0]}") from None
+        return columns[inverse]
+
+    def rate(self, code: str, on: date | str | None = None) -> float:
+        column = self.index.get(code.upper())
+        if column is None:
+            raise UnknownCurrency(f"No rate for currency {code}")
+        value = self.rates[self._date_rows(on), column]
+        if np.isnan(value):
+            raise UnknownCurrency(f"No rate for currency {code} on {on}")
+        return float(value)
+
+    def convert(
+        self,
+        amounts: Sequence[float],
+        currencies: Sequence[str],
+        on: Sequence[date | str] | date | str | None = None,
+    ) -> np.ndarray:
+        """USD value of each amount; ``on`` is one date for all lines, one per line, or latest."""
+        rates = self.rates[self._date_rows(on), self._columns(currencies)]
+        if np.any(np.isnan(rates)):
+            raise UnknownCurrency("Missing rate for some currency on the requested dates")
+        return np.asarray(amounts, dtype=np.float64) * rates
+
+
+class FXProvider:
+    """Rate lookups against a ``RateTable`` that is reloaded every ``ttl`` seconds.
+
+    Call ``start()`` to refresh in a daemon thread; otherwise a stale table
+    is reloaded on the next lookup. A failed reload keeps the current table.
+    """
+
+    def __init__(self, source: str = DEFAULT_RATES_PATH, ttl: float = 3600.0):
+        self.source = source
+        self.ttl = ttl
+        self.table = RateTable.from_csv(_read_source(source))
+        self.loaded_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def refresh(self) -> None:
+        try:
+            table = RateTable.from_csv(_read_source(self.source))
+        except Exception as e:
+            logger.warning(f"FX refresh from {self.source} failed, keeping current rates: {e}")
+        else:
+            # Lookups read self.table once, so swapping the reference is enough
+            self.table = table
+        self.loaded_at = time.monotonic()
+
+    def _current(self) -> RateTable:
+        if self._thread is None and time.monotonic() - self.loaded_at > self.ttl:
+            with self._lock:
+                if time.monotonic() - self.loaded_at > self.ttl:
+                    self.refresh()
+        return self.table
+
+    def _refresh_forever(self) -> None:
+        while not self._stop.wait(self.ttl):
+            self.refresh()
+
+    def start(self) -> "FXProvider":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refresh_forever, name="fx-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def rate(self, code: str, on: date | str | None = None) -> float:
+        return self._current().rate(code, on)
+
+    def convert(
+        self,
+        amounts: Sequence[float],
+        currencies: Sequence[str],
+        on: Sequence[date | str] | date | str | None = None,
+    ) -> np.ndarray:
+        return self._current().convert(amounts, currencies, on)
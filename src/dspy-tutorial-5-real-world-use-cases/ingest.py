@@ -0,0 +1,233 @@
+"""
+Document ingestion for the handbook retrievers.
+
+Streams Markdown, text and PDF files from a directory, splits them into
+overlapping chunks (each chunk repeats the last sentence of the previous
+one, like the original hand-written corpus) and records them in SQLite.
+Re-runs only re-read files whose size/mtime changed and only re-chunk files
+whose content hash changed; new chunks are embedded in batches into the
+on-disk embedding cache.
+
+Run:
+    python ingest.py handbook/
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+from collections.abc import Iterator
+
+from embedding_store import DEFAULT_CACHE_DIR, DEFAULT_MODEL, CachedEmbedder, passage_hash
+
+SUFFIXES = {".md", ".markdown", ".txt", ".pdf"}
+DEFAULT_DB = os.path.join(DEFAULT_CACHE_DIR, "ingest.db")
+DEFAULT_HANDBOOK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "handbook")
+
+# Sentence ends followed by something that starts a new sentence, so "a.m. local" stays whole
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"“(])")
+MARKDOWN_PREFIX = re.compile(r"^\s{0,3}(?:#{1,6}\s+|>\s?|[-*+]\s+|\d+[.)]\s+)")
+MARKDOWN_INLINE = re.compile(r"(\*\*|__|`)")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    path TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (path, position)
+);
+"""
+
+
+def iter_documents(directory: str) -> Iterator[str]:
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in SUFFIXES:
+                yield os.path.join(root, name)
+
+
+def read_paragraphs(path: str, data: bytes) -> list[str]:
+    """Plain-text paragraphs of a document."""
+    if path.lower().endswith(".pdf"):
+        try:
+            from pypdf import PdfReader
+        except ImportError as e:
+            raise ImportError(f"Reading {path} requires pypdf: pip install pypdf") from e
+        import io
+
+        pages = [page.extract_text() or "" for page in PdfReader(io.BytesIO(data)).pages]
+        return [" ".join(page.split()) for page in pages if page.strip()]
+
+    text = data.decode("utf-8", errors="replace")
+    is_markdown = not path.lower().endswith(".txt")
+    paragraphs = []
+    for block in re.split(r"\n\s*\n", text):
+        lines = [line for line in block.splitlines() if line.strip()]
+        if is_markdown:
+            lines = [MARKDOWN_INLINE.sub("", MARKDOWN_PREFIX.sub("", line)) for line in lines]
+        paragraph = " ".join(" ".join(lines).split())
+        if paragraph:
+            paragraphs.append(paragraph)
+    return paragraphs
+
+
+def split_sentences(paragraphs: list[str]) -> list[str]:
+    return [s for paragraph in paragraphs for s in SENTENCE_END.split(paragraph) if s]
+
+
+def chunk_sentences(sentences: list[str], max_chars: int = 600, overlap: int = 1) -> list[str]:
+    """Greedily pack sentences into chunks of about max_chars.
+
+    Each chunk after the first starts with the last ``overlap`` sentences of
+    the previous chunk, so no fact is split across a boundary without context.
+    """
+    chunks = []
+    start = 0
+    while start < len(sentences):
+        end = start + 1
+        size = len(sentences[start])
+        while end < len(sentences) and size + 1 + len(sentences[end]) <= max_chars:
+            size += 1 + len(sentences[end])
+            end += 1
+        chunks.append(" ".join(sentences[start:end]))
+        if end == len(sentences):
+            break
+        # Always move forward, even if a single sentence filled the chunk
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+class Ingestor:
+    """Incremental directory -> chunk pipeline backed by SQLite."""
+
+    def __init__(self, db_path: str = DEFAULT_DB, max_chars: int = 600, overlap: int = 1):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.max_chars = max_chars
+        self.overlap = overlap
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _ingest_file(self, path: str, stats: dict) -> None:
+        st = os.stat(path)
+        row = self.conn.execute("SELECT mtime_ns, size, sha256 FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+            stats["unchanged"] += 1
+            return
+
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+                (path, st.st_mtime_ns, st.st_size, digest),
+            )
+            if row is not None and row[2] == digest:
+                # Touched but not edited
+                stats["unchanged"] += 1
+                return
+            chunks = chunk_sentences(split_sentences(read_paragraphs(path, data)), self.max_chars, self.overlap)
+            self.conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+            self.conn.executemany(
+                "INSERT INTO chunks (path, position, hash, text) VALUES (?, ?, ?, ?)",
+                [(path, i, passage_hash(chunk), chunk) for i, chunk in enumerate(chunks)],
+            )
+        stats["updated"] += 1
+
+    def ingest(self, directory: str) -> dict:
+        """Bring the chunk table in line with ``directory``; returns file counts."""
+        directory = os.path.abspath(directory)
+        stats = {"updated": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+        for path in iter_documents(directory):
+            seen.add(path)
+            self._ingest_file(path, stats)
+
+        prefix = os.path.join(directory, "")
+        known = [p for (p,) in self.conn.execute("SELECT path FROM files") if p.startswith(prefix)]
+        with self.conn:
+            for path in known:
+                if path not in seen:
+                    self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                    self.conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+                    stats["removed"] += 1
+        return stats
+
+    def corpus(self, directory: str) -> list[str]:
+        """Unique chunks under ``directory`` in file and position order."""
+        directory = os.path.abspath(directory)
+        prefix = os.path.join(directory, "")
+        rows = self.conn.execute(
+            "SELECT hash, text FROM chunks WHERE substr(path, 1, ?) = ? ORDER BY path, position",
+            (len(prefix), prefix),
+        )
+        return list({h: text for h, text in rows}.values())
+
+
+def embed_in_batches(corpus: list[str], embedder: CachedEmbedder, batch_size: int = 1024) -> int:
+    """Encode chunks missing from the embedding cache, persisting each batch; returns how many."""
+    missing = [p for p in corpus if passage_hash(p) not in embedder.store.rows]
+    for i in range(0, len(missing), batch_size):
+        embedder.store.embed(missing[i : i + batch_size], embedder.encode)
+    return len(missing)
+
+
+def ingest_corpus(
+    directory: str = DEFAULT_HANDBOOK_DIR,
+    db_path: str = DEFAULT_DB,
+    model_name: str = DEFAULT_MODEL,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    batch_size: int = 1024,
+) -> list[str]:
+    """Incrementally ingest ``directory`` and return its chunks, all embedded and cached."""
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Handbook directory not found: {directory}")
+    ingestor = Ingestor(db_path)
+    try:
+        ingestor.ingest(directory)
+        corpus = ingestor.corpus(directory)
+    finally:
+        ingestor.close()
+    if not corpus:
+        raise ValueError(f"No passages found in {directory} (expected {', '.join(sorted(SUFFIXES))} files)")
+    embedder = CachedEmbedder(model_name, cache_dir)
+    embed_in_batches(corpus, embedder, batch_size)
+    # Vectors of edited or deleted chunks are never looked up again
+    embedder.store.prune(passage_hash(p) for p in corpus)
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest a directory of documents into the handbook corpus")
+    parser.add_argument("directory", nargs="?", default=DEFAULT_HANDBOOK_DIR)
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--max-chars", type=int, default=600)
+    parser.add_argument("--no-embed", action="store_true", help="only chunk, do not compute embeddings")
+    args = parser.parse_args()
+
+    ingestor = Ingestor(args.db, max_chars=args.max_chars)
+    stats = ingestor.ingest(args.directory)
+    corpus = ingestor.corpus(args.directory)
+    ingestor.close()
+    print(f"Files: {stats['updated']} updated, {stats['unchanged']} unchanged, {stats['removed']} removed")
+    print(f"Chunks: {len(corpus)}")
+    if not args.no_embed:
+        embedder = CachedEmbedder()
+        print(f"Embedded {embed_in_batches(corpus, embedder)} new chunks")
+        print(f"Pruned {embedder.store.prune(passage_hash(p) for p in corpus)} stale vectors")
+
+
+if __name__ == "__main__":
+    main()
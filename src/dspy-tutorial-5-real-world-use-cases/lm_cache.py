@@ -0,0 +1,125 @@
+"""
+Persistent, deterministic LM response cache for optimisation runs.
+
+``CachedLM`` is a drop-in ``dspy.LM`` that stores every response in SQLite,
+keyed on the model, the prompt messages and all sampling parameters. A
+repeat MIPROv2 run or baseline evaluation is then answered from disk.
+
+``LM_CACHE_MODE`` selects the behaviour:
+
+    readwrite  (default) serve hits, call the API on a miss and store it
+    replay     serve hits, raise LMCacheMiss on a miss (for CI: no API calls)
+    off        always call the API
+
+``LM_CACHE_PATH`` overrides where the database lives (default:
+``.lm_cache/responses.db`` next to this module, whatever the working directory).
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+
+import dspy
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "LM_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".lm_cache", "responses.db")
+)
+MODES = ("readwrite", "replay", "off")
+
+# Request options that do not change the response
+IGNORED_KWARGS = {"num_retries", "cache", "callbacks"}
+
+
+class LMCacheMiss(RuntimeError):
+    pass
+
+
+def request_key(model: str, messages: list[dict], kwargs: dict) -> str:
+    params = {k: v for k, v in kwargs.items() if k not in IGNORED_KWARGS}
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe SQLite store of pickled LM responses with hit/miss counters."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, model TEXT, response BLOB)"
+        )
+        self._conn.commit()
+
+    def __deepcopy__(self, memo):
+        # LM.copy() deep-copies the LM; copies share one store and its counters
+        return self
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key: str, model: str, response) -> None:
+        blob = pickle.dumps(response)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response) VALUES (?, ?, ?)",
+                (key, model, blob),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.0%} hit rate), {len(self)} stored"
+
+
+class CachedLM(dspy.LM):
+    """``dspy.LM`` backed by a ResponseCache instead of DSPy's own cache.
+
+    DSPy's built-in cache is disabled so every lookup is counted here.
+    """
+
+    def __init__(self, model: str, cache_path: str = DEFAULT_CACHE_PATH, mode: str | None = None, **kwargs):
+        kwargs["cache"] = False
+        super().__init__(model, **kwargs)
+        self.mode = mode or os.getenv("LM_CACHE_MODE", "readwrite")
+        if self.mode not in MODES:
+            raise ValueError(f"LM_CACHE_MODE must be one of {MODES}, got {self.mode!r}")
+        self.response_cache = ResponseCache(cache_path)
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        if self.mode == "off":
+            return super().forward(prompt=prompt, messages=messages, **kwargs)
+
+        messages = messages or [{"role": "user", "content": prompt}]
+        key = request_key(self.model, messages, {**self.kwargs, **kwargs})
+        response = self.response_cache.get(key)
+        if response is not None:
+            return response
+        if self.mode == "replay":
+            raise LMCacheMiss(f"No cached {self.model} response for request {key[:12]} (LM_CACHE_MODE=replay)")
+
+        response = super().forward(messages=messages, **kwargs)
+        self.response_cache.put(key, self.model, response)
+        return response
@@ -0,0 +1,62 @@
+"""
+Concurrent evaluation of a DSPy program over a devset.
+
+Examples run on a thread pool, so at most ``num_threads`` program calls (and
+therefore LM calls, for single-call programs) are in flight at once. Results
+are yielded as soon as each example finishes instead of after the whole set.
+"""
+
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+
+import dspy
+
+
+@dataclass
+class ExampleResult:
+    index: int
+    example: dspy.Example
+    prediction: dspy.Prediction | None
+    score: float
+    error: Exception | None = None
+
+
+def iter_evaluate(
+    program: Callable,
+    dataset: list[dspy.Example],
+    metric: Callable,
+    num_threads: int = 8,
+) -> Iterator[ExampleResult]:
+    """Run ``program`` on every example, yielding results in completion order.
+
+    A failing example scores 0 and carries its exception instead of
+    aborting the run.
+    """
+
+    def run(index: int, example: dspy.Example) -> ExampleResult:
+        try:
+            pred = program(**example.inputs())
+            return ExampleResult(index, example, pred, metric(example, pred))
+        except Exception as e:
+            return ExampleResult(index, example, None, 0, e)
+
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        futures = [pool.submit(run, i, ex) for i, ex in enumerate(dataset)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def shared_retrieval(search: Callable, maxsize: int = 4096) -> Callable[[str], tuple[str, ...]]:
+    """Memoise ``search(question).passages`` per question.
+
+    Retrieval does not depend on the prompt being optimised, so every
+    candidate program (and every re-evaluation) can share the same results.
+    """
+
+    @lru_cache(maxsize=maxsize)
+    def retrieve(question: str) -> tuple[str, ...]:
+        return tuple(search(question).passages)
+
+    return retrieve
@@ -0,0 +1,187 @@
+"""
+Rule-based fast path for the SupportEmail extractor.
+
+``RuleClassifier`` fills the SupportEmail fields from a subject-line regex,
+a product alias catalogue and keyword lexicons, each compiled into a single
+alternation so an email is scanned once per field. Every field gets a
+confidence, and ``CascadeExtractor`` only sends an email to the LM when the
+weakest field is below the threshold.
+"""
+
+import re
+import threading
+import time
+from collections.abc import Callable
+
+PRODUCT_ALIASES = {
+    "AlphaTab 11": [r"alpha\s*-?\s*tab\s*11"],
+    "AlphaTab": [r"alpha\s*-?\s*tabs?\b(?!\s*11)"],
+    "CloudSync Pro": [r"cloud\s*-?\s*sync\s*pro"],
+}
+
+PRIORITY_TERMS = {
+    "high": [
+        "urgent", "asap", "immediately", "broken", "cracked", "shattered", "outage", "down",
+        "not working", "stopped working", "can't access", "cannot access", "data loss",
+        "security", "hacked", "refund", "replacement", "charged twice",
+    ],
+    "medium": [
+        "renewal", "renewed", "billing", "invoice", "switch", "upgrade", "downgrade", "plan",
+        "how do i", "could you advise", "error", "password reset",
+    ],
+    "low": ["feedback", "suggestion", "fan", "love", "loving", "buy more", "just wanted", "great job"],
+}
+
+NEGATIVE_TERMS = [
+    "disappointed", "frustrated", "angry", "terrible", "awful", "unacceptable", "worst",
+    "broken", "cracked", "shattered", "annoyed", "useless", "never again", "refund",
+    "ridiculous", "pathetic", "money back", "fed up",
+]
+POSITIVE_TERMS = ["thanks", "thank you", "love", "loving", "great", "happy", "awesome", "fan", "xoxo"]
+
+NEGATIONS = ["not", "no", "never", "isn't", "wasn't", "don't", "didn't", "not very", "not so"]
+
+SUBJECT_RE = re.compile(r"^\s*Subject:\s*(.+?)\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+def _alternation(terms: list[str], prefixes: list[str] | None = None) -> re.Pattern:
+    """One compiled pattern matching any term as a whole word, optionally after one of ``prefixes``."""
+
+    def body(words: list[str]) -> str:
+        ordered = sorted(words, key=len, reverse=True)
+        return "|".join(re.escape(t).replace(r"\ ", r"\s+") for t in ordered)
+
+    prefix = rf"(?:{body(prefixes)})\s+" if prefixes else ""
+    return re.compile(rf"\b{prefix}(?:{body(terms)})\b", re.IGNORECASE)
+
+
+class RuleClassifier:
+    """Keyword/regex predictor for SupportEmail fields with per-field confidence."""
+
+    def __init__(self, product_aliases: dict[str, list[str]] = PRODUCT_ALIASES):
+        self.products = re.compile(
+            "|".join(
+                f"(?P<p{i}>{'|'.join(aliases)})" for i, aliases in enumerate(product_aliases.values())
+            ),
+            re.IGNORECASE,
+        )
+        self.product_names = list(product_aliases)
+        self.priority = {level: _alternation(terms) for level, terms in PRIORITY_TERMS.items()}
+        self.negative = _alternation(NEGATIVE_TERMS)
+        self.positive = _alternation(POSITIVE_TERMS)
+        self.negated_positive = _alternation(POSITIVE_TERMS, NEGATIONS)
+
+    def _products(self, email: str) -> tuple[str, float]:
+        found = []
+        for match in self.products.finditer(email):
+            name = self.product_names[int(match.lastgroup[1:])]
+            if name not in found:
+                found.append(name)
+        # An unknown product may still be mentioned, so no match is not a confident ""
+        return ", ".join(found), 1.0 if found else 0.0
+
+    def _priority(self, email: str) -> tuple[str, float]:
+        hits = {level: len(pattern.findall(email)) for level, pattern in self.priority.items()}
+        total = sum(hits.values())
+        if not total:
+            return "medium", 0.0
+        # Escalate: any high-priority signal outweighs routine or friendly wording
+        if hits["high"]:
+            return "high", 0.95
+        level = max(hits, key=hits.get)
+        return level, 0.95 * hits[level] / total
+
+    def _sentiment(self, email: str) -> tuple[bool, float]:
+        # "not happy" is a complaint, not praise
+        negated = len(self.negated_positive.findall(email))
+        negative = len(self.negative.findall(email)) + negated
+        positive = len(self.positive.findall(email)) - negated
+        # Like products, no lexicon hit is no evidence either way
+        if negative == positive:
+            return False, 0.0
+        return negative > positive, abs(negative - positive) / (negative + positive)
+
+    def predict(self, email: str) -> tuple[dict, float]:
+        """(ticket fields, confidence of the weakest field)."""
+        subject = SUBJECT_RE.search(email)
+        fields = {
+            "subject": (subject.group(1) if subject else "", 1.0 if subject else 0.0),
+            "priority": self._priority(email),
+            "product": self._products(email),
+            "negative_sentiment": self._sentiment(email),
+        }
+        ticket = {name: value for name, (value, _) in fields.items()}
+        return ticket, min(confidence for _, confidence in fields.values())
+
+
+class CascadeExtractor:
+    """Rules first; emails below ``threshold`` confidence fall through to ``lm_extract``.
+
+    ``lm_extract(email)`` must return a ticket dict. Counters and timings are
+    thread-safe so the extractor can run under the batch runner.
+    """
+
+    def __init__(
+        self,
+        lm_extract: Callable[[str], dict],
+        classifier: RuleClassifier | None = None,
+        threshold: float = 0.8,
+    ):
+        self.lm_extract = lm_extract
+        self.classifier = classifier or RuleClassifier()
+        self.threshold = threshold
+        self.rule_hits = 0
+        self.lm_calls = 0
+        self.rule_seconds = 0.0
+        self.lm_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, email: str) -> dict:
+        start = time.perf_counter()
+        ticket, confidence = self.classifier.predict(email)
+        rule_time = time.perf_counter() - start
+        if confidence >= self.threshold:
+            with self._lock:
+                self.rule_hits += 1
+                self.rule_seconds += rule_time
+            return {**ticket, "source": "rules"}
+
+        start = time.perf_counter()
+        ticket = self.lm_extract(email)
+        with self._lock:
+            self.lm_calls += 1
+            self.rule_seconds += rule_time
+            self.lm_seconds += time.perf_counter() - start
+        return {**ticket, "source": "lm"}
+
+    def summary(self) -> str:
+        total = self.rule_hits + self.lm_calls
+        if not total:
+            return "cascade: no emails"
+        line = (
+            f"cascade: {self.rule_hits}/{total} by rules ({self.rule_hits / total:.0%}), "
+            f"{self.lm_calls} LM calls"
+        )
+        if self.lm_calls:
+            lm_mean = self.lm_seconds / self.lm_calls
+            saved = self.rule_hits * lm_mean - self.rule_seconds
+            line += f"; mean LM call {lm_mean:.2f}s, ~{saved:.1f}s of LM time saved"
+        return line
+
+
+# Emails the rules once got confidently wrong: each must be right or left to the LM
+REGRESSION_EMAILS = [
+    ("Subject: Broken again\n\nMy AlphaTab 11 stopped working after a week. This is ridiculous, I want my money back.", True),
+    ("Subject: Sync outage\n\nCloudSync Pro is down again and nobody answers. Pathetic.", True),
+    ("Subject: Not happy\n\nThe AlphaTab keyboard case is not great, the hinge squeaks.", True),
+    ("Subject: Renewal question\n\nHow do I switch my CloudSync Pro plan to annual billing?", False),
+]
+
+
+if __name__ == "__main__":
+    classifier = RuleClassifier()
+    for email, negative in REGRESSION_EMAILS:
+        ticket, confidence = classifier.predict(email)
+        ok = confidence < 0.8 or ticket["negative_sentiment"] == negative
+        print(f"{'ok ' if ok else 'BAD'} negative={ticket['negative_sentiment']} conf={confidence:.2f} {ticket['subject']}")
+        assert ok, email
@@ -0,0 +1,140 @@
+"""
+Safe arithmetic for the expense agent's Calc tool.
+
+Expressions are parsed with ``ast`` and only numbers, variables, + - * / //
+% ** (bounded), unary +/- and a few math functions are allowed. Each
+expression is compiled once into a tree of closures and kept in an LRU
+cache, so the agent's repeated conversions skip parsing entirely.
+``evaluate_batch`` evaluates one expression over arrays of variable values.
+"""
+
+import ast
+import math
+import operator
+from collections.abc import Callable
+from functools import lru_cache, reduce
+
+import numpy as np
+
+MAX_EXPONENT = 100
+
+BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+# name -> (scalar implementation, array implementation)
+FUNCTIONS = {
+    "abs": (abs, np.abs),
+    "round": (round, np.round),
+    "min": (min, lambda *args: reduce(np.minimum, args)),
+    "max": (max, lambda *args: reduce(np.maximum, args)),
+    "sqrt": (math.sqrt, np.sqrt),
+    "floor": (math.floor, np.floor),
+    "ceil": (math.ceil, np.ceil),
+}
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+
+class UnsafeExpression(ValueError):
+    pass
+
+
+def _power(base, exponent):
+    if np.any(np.abs(exponent) > MAX_EXPONENT):
+        raise UnsafeExpression(f"Exponent larger than {MAX_EXPONENT}")
+    # Float powers overflow instead of building huge ints, e.g. ((10**100)**100)**100
+    if not isinstance(base, np.ndarray) and not isinstance(exponent, np.ndarray):
+        try:
+            result = float(base) ** exponent
+        except OverflowError as e:
+            raise UnsafeExpression("Result of ** is too large") from e
+        if isinstance(result, complex):
+            raise UnsafeExpression("Fractional power of a negative number")
+        return result
+    with np.errstate(over="raise", invalid="ignore"):
+        try:
+            return base**exponent
+        except FloatingPointError as e:
+            raise UnsafeExpression("Result of ** is too large") from e
+
+
+def _compile(node: ast.AST, names: set[str]) -> Callable:
+    """Turn a validated AST node into ``f(env, vectorized) -> value``."""
+    if isinstance(node, ast.Expression):
+        return _compile(node.body, names)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda env, vec: value
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda env, vec: value
+        names.add(name)
+        return lambda env, vec: env[name]
+    if isinstance(node, ast.BinOp):
+        left, right = _compile(node.left, names), _compile(node.right, names)
+        if isinstance(node.op, ast.Pow):
+            return lambda env, vec: _power(left(env, vec), right(env, vec))
+        op = BINARY_OPS.get(type(node.op))
+        if op is None:
+            raise UnsafeExpression(f"Operator {type(node.op).__name__} is not allowed")
+        return lambda env, vec: op(left(env, vec), right(env, vec))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPS:
+        op, operand = UNARY_OPS[type(node.op)], _compile(node.operand, names)
+        return lambda env, vec: op(operand(env, vec))
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in FUNCTIONS
+        and not node.keywords
+    ):
+        scalar, vectorized = FUNCTIONS[node.func.id]
+        args = [_compile(arg, names) for arg in node.args]
+        return lambda env, vec: (vectorized if vec else scalar)(*(a(env, vec) for a in args))
+    raise UnsafeExpression(f"Unsupported syntax: {ast.dump(node)[:60]}")
+
+
+class CompiledExpression:
+    def __init__(self, source: str):
+        self.source = source
+        try:
+            tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as e:
+            raise UnsafeExpression(f"Unable to parse expression '{source}'") from e
+        self.names: set[str] = set()
+        self._fn = _compile(tree, self.names)
+
+    def _check(self, env: dict) -> None:
+        missing = self.names - env.keys()
+        if missing:
+            raise UnsafeExpression(f"Unknown names in '{self.source}': {', '.join(sorted(missing))}")
+
+    def __call__(self, **env) -> float:
+        self._check(env)
+        return self._fn(env, False)
+
+    def batch(self, **arrays) -> np.ndarray:
+        """Evaluate once over arrays (or scalars) of variable values, with NumPy broadcasting."""
+        self._check(arrays)
+        env = {name: np.asarray(value, dtype=float) for name, value in arrays.items()}
+        return np.asarray(self._fn(env, True), dtype=float)
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(source: str) -> CompiledExpression:
+    return CompiledExpression(source)
+
+
+def evaluate(expression: str, **env) -> float:
+    return compile_expression(expression)(**env)
+
+
+def evaluate_batch(expression: str, **arrays) -> np.ndarray:
+    """e.g. ``evaluate_batch("amount * rate", amount=[120, 80], rate=[1.07, 1.26])``."""
+    return compile_expression(expression).batch(**arrays)